@@ -35,6 +35,14 @@ class AccountRepository:
             logger.error("Failed to read accounts file: %s", exc)
             raise HTTPException(status_code=500, detail="Failed to read accounts file")
 
+    def file_signature(self) -> tuple[int, int] | None:
+        """返回账户文件的 (st_mtime_ns, st_size)，用于判断文件是否变化"""
+        try:
+            stat = self._path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
     def write_all(self, accounts: Dict[str, Dict[str, object]], *, source: str = "auto") -> None:
         self._write_to_disk(accounts)
         self._sync_to_database(accounts, source=source)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import threading
 from datetime import datetime, timedelta, timezone
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException
 
@@ -38,20 +39,40 @@ class AccountService:
     def __init__(self, repository: AccountRepository, synchronizer: AccountSynchronizer | None = None) -> None:
         self._repository = repository
         self._synchronizer = synchronizer
+        # email_id -> (status, credentials)；账户文件变化（含本进程写入）后整体失效
+        self._credentials_cache: Dict[str, Tuple[object, AccountCredentials]] = {}
+        self._credentials_signature: tuple[int, int] | None = None
+        self._credentials_lock = threading.Lock()
 
     def get_credentials(self, email_id: str, *, require_active: bool = False) -> AccountCredentials:
-        accounts = self._repository.read_all()
-        if email_id not in accounts:
-            logger.warning("Account %s not found in accounts file", email_id)
-            raise HTTPException(status_code=404, detail=f"Account {email_id} not found")
-
-        account_info = accounts[email_id]
-        if require_active:
-            status = account_info.get("status", "active")
-            if status == "expired":
+        signature = self._repository.file_signature()
+        with self._credentials_lock:
+            if signature != self._credentials_signature:
+                self._credentials_cache.clear()
+                self._credentials_signature = signature
+            cached = self._credentials_cache.get(email_id)
+
+        if cached is None:
+            accounts = self._repository.read_all()
+            if email_id not in accounts:
+                logger.warning("Account %s not found in accounts file", email_id)
+                raise HTTPException(status_code=404, detail=f"Account {email_id} not found")
+
+            status = accounts[email_id].get("status", "active")
+            if require_active and status == "expired":
                 raise HTTPException(status_code=409, detail="账户授权已过期，请重新验证")
-
-        return get_account_credentials(self._repository, email_id, accounts=accounts)
+            credentials = get_account_credentials(self._repository, email_id, accounts=accounts)
+            cached = (status, credentials)
+            if signature is not None:
+                with self._credentials_lock:
+                    # 读取期间文件若已变化，签名不同的缓存会在下次调用时被清空
+                    if signature == self._credentials_signature:
+                        self._credentials_cache[email_id] = cached
+
+        status, credentials = cached
+        if require_active and status == "expired":
+            raise HTTPException(status_code=409, detail="账户授权已过期，请重新验证")
+        return credentials
 
     def list_accounts(
         self,
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import copy
 import json
 import re
+import threading
 from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from hashlib import sha256
-from typing import Dict, Iterable, Set, Tuple
+from hashlib import blake2b
+from typing import Dict, Iterable, Iterator, Set, Tuple
 
 import psycopg2
 from psycopg2.extras import RealDictCursor
@@ -49,12 +49,19 @@ class SyncReport:
 class AccountSynchronizer:
     _TABLE_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_]+$")
     _SUPPORTED_CONFLICT_STRATEGIES = {"prefer_local", "prefer_remote"}
+    # 已删除（墓碑）账户的 tags 固定为空数组，按标签查询时不会命中已删除账户
+    _TAGS_COLUMN_EXPRESSION = "(CASE WHEN \"is_deleted\" THEN '[]' ELSE ((\"data\"::jsonb -> 'tags')::text) END)"
 
     def __init__(self) -> None:
         self._conflict_strategy = self._normalise_conflict_strategy(ACCOUNTS_SYNC_CONFLICT)
         self._table_name = self._normalise_table_name(ACCOUNTS_DB_TABLE)
         self._tags_table = f"{self._table_name}_tags"
         self._schema_ready = False
+        # 后台同步合并：运行期间到达的多次推送只保留最新快照，当前轮结束后再执行一次
+        self._sync_lock = threading.Lock()
+        self._pending_snapshot: Tuple[Dict[str, Dict[str, object]], str] | None = None
+        self._pending_future: Future | None = None
+        self._running = False
 
     @property
     def is_enabled(self) -> bool:
@@ -78,23 +85,19 @@ class AccountSynchronizer:
         try:
             self._ensure_schema(connection)
 
-            with connection.cursor() as cursor:
-                cursor.execute(f"SELECT email, checksum, is_deleted, tags, note FROM \"{self._table_name}\"")
-                existing = {row["email"]: row for row in cursor.fetchall()}
-
             normalised_accounts, tags_target = self._prepare_tags_snapshot(accounts)
             current_emails = set(normalised_accounts.keys())
-            all_emails_for_tags = set(existing.keys()) | current_emails
-            tags_existing = self._fetch_existing_tags(connection, all_emails_for_tags)
 
             with connection.cursor() as cursor:
+                # 数据库只是 accounts.json 的备份镜像：本事务提交时不等待 WAL 落盘，
+                # 服务器崩溃最多丢失最近一次推送，可由下一次同步重新写入
+                cursor.execute("SET LOCAL synchronous_commit TO OFF")
                 for email, normalised_payload in normalised_accounts.items():
                     # 详细日志：推送前的数据状态
                     logger.debug("=== 推送账户 %s ===", email)
                     logger.debug("推送前标准化数据: %s", json.dumps(normalised_payload, indent=2, ensure_ascii=False))
                     
                     serialised = self._serialise_payload(normalised_payload)
-                    tags_serialised = self._serialise_tags(normalised_payload.get("tags", []))
                     checksum = self._checksum(serialised)
                     
                     # 详细日志：推送时的序列化和校验和
@@ -113,56 +116,49 @@ class AccountSynchronizer:
                         else:
                             logger.debug("推送令牌失败次数: %s (类型: %s)", token_failures, type(token_failures))
 
-                    if email not in existing:
-                        note_value = normalised_payload.get("note")
-                        cursor.execute(
-                            f"""
-                            INSERT INTO "{self._table_name}" (email, data, checksum, tags, note, is_deleted, source)
-                            VALUES (%s, %s, %s, %s, %s, FALSE, %s)
-                            """,
-                            (email, serialised, checksum, tags_serialised, note_value, source),
-                        )
-                        added += 1
-                        continue
-
-                    row = existing[email]
-                    if row["checksum"] != checksum or row["is_deleted"]:
-                        logger.debug("更新账户 %s：校验和不同 (本地=%s, 远程=%s) 或已删除 (is_deleted=%s)",
-                                   email, row["checksum"], checksum, row["is_deleted"])
-                        note_value = normalised_payload.get("note")
-                        cursor.execute(
-                            f"""
-                            UPDATE "{self._table_name}"
-                            SET data = %s,
-                                checksum = %s,
-                                tags = %s,
-                                note = %s,
-                                is_deleted = FALSE,
-                                source = %s
-                            WHERE email = %s
-                            """,
-                            (serialised, checksum, tags_serialised, note_value, source, email),
-                        )
-                        updated += 1
-                    else:
-                        logger.debug("跳过账户 %s：校验和相同且未删除 (checksum=%s)", email, checksum)
-
-                for email, row in existing.items():
-                    if email in current_emails or row["is_deleted"]:
-                        continue
+                    # 由数据库判断新增/更新/跳过：校验和相同且未删除的行不会被更新，也不会返回结果
+                    note_value = normalised_payload.get("note")
                     cursor.execute(
                         f"""
-                        UPDATE "{self._table_name}"
-                        SET is_deleted = TRUE,
-                            tags = %s,
-                            note = NULL,
-                            source = %s
-                        WHERE email = %s
+                        INSERT INTO "{self._table_name}" (email, data, checksum, note, is_deleted, source)
+                        VALUES (%s, %s, %s, %s, FALSE, %s)
+                        ON CONFLICT (email) DO UPDATE
+                        SET data = EXCLUDED.data,
+                            checksum = EXCLUDED.checksum,
+                            note = EXCLUDED.note,
+                            is_deleted = FALSE,
+                            source = EXCLUDED.source
+                        WHERE "{self._table_name}".checksum <> EXCLUDED.checksum
+                            OR "{self._table_name}".is_deleted
+                        RETURNING (xmax = 0) AS inserted
                         """,
-                        (self._serialise_tags([]), source, email),
+                        (email, serialised, checksum, note_value, source),
                     )
-                    marked_deleted += 1
+                    upserted = cursor.fetchone()
+                    if upserted is None:
+                        logger.debug("跳过账户 %s：校验和相同且未删除 (checksum=%s)", email, checksum)
+                    elif upserted["inserted"]:
+                        added += 1
+                    else:
+                        logger.debug("更新账户 %s：校验和不同或已删除 (checksum=%s)", email, checksum)
+                        updated += 1
+
+                cursor.execute(
+                    f"""
+                    UPDATE "{self._table_name}"
+                    SET is_deleted = TRUE,
+                        note = NULL,
+                        source = %s
+                    WHERE is_deleted = FALSE AND NOT (email = ANY(%s))
+                    RETURNING email
+                    """,
+                    (source, list(current_emails)),
+                )
+                removed_emails = {row["email"] for row in cursor.fetchall()}
+                marked_deleted = len(removed_emails)
 
+            all_emails_for_tags = current_emails | removed_emails
+            tags_existing = self._fetch_existing_tags(connection, all_emails_for_tags)
             for email in all_emails_for_tags:
                 self._apply_tag_mutations(
                     connection,
@@ -185,28 +181,64 @@ class AccountSynchronizer:
     def enqueue_file_to_db(self, accounts: Dict[str, Dict[str, object]], *, source: str = "auto") -> Future | None:
         if not self.is_enabled:
             return None
-        snapshot = copy.deepcopy(accounts)
-        future = _sync_executor.submit(self.sync_file_to_db, snapshot, source=source)
-        future.add_done_callback(self._log_async_result)
+        snapshot = self._snapshot_accounts(accounts)
+        with self._sync_lock:
+            self._pending_snapshot = (snapshot, source)
+            if self._pending_future is None:
+                self._pending_future = Future()
+                self._pending_future.add_done_callback(self._log_async_result)
+            future = self._pending_future
+            if not self._running:
+                self._running = True
+                _sync_executor.submit(self._drain_pending_syncs)
         return future
 
+    def _drain_pending_syncs(self) -> None:
+        while True:
+            with self._sync_lock:
+                if self._pending_snapshot is None:
+                    self._running = False
+                    return
+                (snapshot, source), future = self._pending_snapshot, self._pending_future
+                self._pending_snapshot = None
+                self._pending_future = None
+
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self.sync_file_to_db(snapshot, source=source))
+            except Exception as exc:  # noqa: BLE001
+                future.set_exception(exc)
+
     def sync_db_to_file(self, local_accounts: Dict[str, Dict[str, object]]) -> Tuple[Dict[str, Dict[str, object]], SyncReport, bool]:
         if not self.is_enabled:
             raise RuntimeError("数据库同步未配置")
 
         connection = self._connect()
-        tags_map: Dict[str, Set[str]] = {}
+        remote_accounts: Dict[str, Dict[str, object]] = {}
 
         try:
             self._ensure_schema(connection)
-            with connection.cursor() as cursor:
+            tags_map = self._fetch_all_tags(connection)
+            # 使用服务端游标逐批读取，避免一次性把所有行加载到内存
+            with connection.cursor(name=f"{self._table_name}_pull") as cursor:
+                cursor.itersize = 500
                 cursor.execute(f"SELECT email, data, checksum, is_deleted, tags, note FROM \"{self._table_name}\"")
-                rows = cursor.fetchall()
-            tags_map = self._fetch_existing_tags(connection, [row["email"] for row in rows])
+                for email, record in self._iter_remote_accounts(cursor, tags_map):
+                    remote_accounts[email] = record
         finally:
             connection.close()
 
-        remote_accounts: Dict[str, Dict[str, object]] = {}
+        logger.debug("开始合并远程账户数据到本地，远程账户数量: %d", len(remote_accounts))
+        merged_accounts, report, changed = self._merge_remote_into_local(local_accounts, remote_accounts)
+        logger.debug("合并完成，报告: %s, 是否有变更: %s", report.message, changed)
+        return merged_accounts, report, changed
+
+    def _iter_remote_accounts(
+        self,
+        rows: Iterable[Dict[str, object]],
+        tags_map: Dict[str, Set[str]],
+    ) -> Iterator[Tuple[str, Dict[str, object]]]:
         for row in rows:
             try:
                 payload = json.loads(row["data"]) if row["data"] else {}
@@ -230,7 +262,8 @@ class AccountSynchronizer:
             # 详细日志：标准化前的数据
             logger.debug("标准化前数据: %s", json.dumps(payload, indent=2, ensure_ascii=False))
             
-            normalised_payload = self._normalise_payload(payload)
+            # 写入时已经标准化过，这里只补齐缺失的 tags
+            normalised_payload = payload if "tags" in payload else {**payload, "tags": []}
             note_from_column = self._normalise_note_value(row.get("note"))
             if note_from_column is not None:
                 normalised_payload["note"] = note_from_column
@@ -284,17 +317,12 @@ class AccountSynchronizer:
                 else:
                     logger.debug("拉取标准化后令牌失败次数: %s (类型: %s)", token_failures, type(token_failures))
             
-            remote_accounts[row["email"]] = {
+            yield row["email"], {
                 "data": normalised_payload,
                 "checksum": combined_checksum,
                 "is_deleted": bool(row["is_deleted"]),
             }
 
-        logger.debug("开始合并远程账户数据到本地，远程账户数量: %d", len(remote_accounts))
-        merged_accounts, report, changed = self._merge_remote_into_local(local_accounts, remote_accounts)
-        logger.debug("合并完成，报告: %s, 是否有变更: %s", report.message, changed)
-        return merged_accounts, report, changed
-
     def _merge_remote_into_local(
         self,
         local_accounts: Dict[str, Dict[str, object]],
@@ -454,8 +482,8 @@ class AccountSynchronizer:
                 CREATE TABLE IF NOT EXISTS "{self._table_name}" (
                     "email" VARCHAR(255) NOT NULL PRIMARY KEY,
                     "data" TEXT NOT NULL,
-                    "checksum" CHAR(64) NOT NULL,
-                    "tags" TEXT,
+                    "checksum" BIGINT NOT NULL,
+                    "tags" TEXT GENERATED ALWAYS AS {self._TAGS_COLUMN_EXPRESSION} STORED,
                     "note" TEXT,
                     "is_deleted" BOOLEAN NOT NULL DEFAULT FALSE,
                     "source" VARCHAR(32) NOT NULL DEFAULT 'unknown',
@@ -463,13 +491,22 @@ class AccountSynchronizer:
                 )
                 """
             )
-            cursor.execute(f"SELECT column_name FROM information_schema.columns WHERE table_name='{self._table_name}' AND column_name='tags'")
-            has_tags_column = cursor.fetchone()
-            if not has_tags_column:
-                cursor.execute(f"ALTER TABLE \"{self._table_name}\" ADD COLUMN \"tags\" TEXT")
+            cursor.execute(f"SELECT data_type FROM information_schema.columns WHERE table_name='{self._table_name}' AND column_name='checksum'")
+            checksum_column = cursor.fetchone()
+            if checksum_column and checksum_column.get("data_type") != "bigint":
+                # 旧表使用 SHA-256 十六进制校验和，置零后由下一次推送重新写入
+                cursor.execute(f"ALTER TABLE \"{self._table_name}\" ALTER COLUMN \"checksum\" TYPE BIGINT USING 0")
+            cursor.execute(f"SELECT is_generated, generation_expression FROM information_schema.columns WHERE table_name='{self._table_name}' AND column_name='tags'")
+            tags_column = cursor.fetchone()
+            if (
+                not tags_column
+                or tags_column.get("is_generated") != "ALWAYS"
+                or "is_deleted" not in (tags_column.get("generation_expression") or "")
+            ):
+                # 旧表中的 tags 为独立写入的列（或未区分已删除账户的生成列），迁移为当前的生成列
+                cursor.execute(f"ALTER TABLE \"{self._table_name}\" DROP COLUMN IF EXISTS \"tags\"")
                 cursor.execute(
-                    f"UPDATE \"{self._table_name}\" SET \"tags\" = %s WHERE \"tags\" IS NULL",
-                    (self._serialise_tags([]),),
+                    f"ALTER TABLE \"{self._table_name}\" ADD COLUMN \"tags\" TEXT GENERATED ALWAYS AS {self._TAGS_COLUMN_EXPRESSION} STORED"
                 )
             cursor.execute(f"SELECT column_name FROM information_schema.columns WHERE table_name='{self._table_name}' AND column_name='note'")
             has_note_column = cursor.fetchone()
@@ -487,6 +524,9 @@ class AccountSynchronizer:
                 """
             )
             cursor.execute(f"CREATE INDEX IF NOT EXISTS \"idx_{self._tags_table}_email\" ON \"{self._tags_table}\" (\"email\")")
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS \"idx_{self._table_name}_is_deleted_email\" ON \"{self._table_name}\" (\"is_deleted\", \"email\")"
+            )
             cursor.execute(f"SELECT COUNT(*) AS cnt FROM \"{self._tags_table}\"")
             tag_count_row = cursor.fetchone() or {"cnt": 0}
             if (tag_count_row.get("cnt") or 0) == 0:
@@ -545,6 +585,18 @@ class AccountSynchronizer:
             tags_snapshot[email] = set(normalised.get("tags", []))
         return normalised_accounts, tags_snapshot
 
+    def _fetch_all_tags(self, connection: "psycopg2.extensions.connection") -> Dict[str, Set[str]]:
+        tags_map: Dict[str, Set[str]] = {}
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT email, tag FROM \"{self._tags_table}\"")
+            for row in cursor.fetchall():
+                email = row.get("email")
+                tag = row.get("tag")
+                if not email or not tag:
+                    continue
+                tags_map.setdefault(email, set()).add(tag)
+        return tags_map
+
     def _fetch_existing_tags(
         self,
         connection: "psycopg2.extensions.connection",
@@ -607,6 +659,20 @@ class AccountSynchronizer:
                         (email, *chunk),
                     )
 
+    @staticmethod
+    def _snapshot_accounts(accounts: Dict[str, Dict[str, object]]) -> Dict[str, Dict[str, object]]:
+        # 账户数据是浅层 JSON，复制到第二层的 list/dict 即可与调用方隔离
+        snapshot: Dict[str, Dict[str, object]] = {}
+        for email, payload in accounts.items():
+            entry = dict(payload)
+            for key, value in entry.items():
+                if isinstance(value, list):
+                    entry[key] = list(value)
+                elif isinstance(value, dict):
+                    entry[key] = dict(value)
+            snapshot[email] = entry
+        return snapshot
+
     @staticmethod
     def _chunked(items: Iterable[object], size: int) -> Iterable[list[object]]:
         batch: list[object] = []
@@ -717,6 +783,9 @@ class AccountSynchronizer:
     def _normalise_payload(self, payload: Dict[str, object] | None) -> Dict[str, object]:
         if payload is None:
             return {}
+        if self._is_normalised(payload):
+            # 常见情况：数据已是标准格式，无需复制和重建
+            return payload
         normalised = dict(payload)
         
         # 添加调试日志：记录原始状态字段
@@ -836,6 +905,43 @@ class AccountSynchronizer:
 
         return normalised
 
+    @classmethod
+    def _is_normalised(cls, payload: Dict[str, object]) -> bool:
+        """判断 payload 是否已满足 _normalise_payload 的输出格式"""
+        tags = payload.get("tags")
+        if type(tags) is not list or not all(type(tag) is str and tag and tag == tag.strip() for tag in tags):
+            return False
+
+        if "note" in payload:
+            note = payload["note"]
+            if type(note) is not str or cls._normalise_note_value(note) != note:
+                return False
+
+        for key in ("status", "status_reason"):
+            if key in payload:
+                value = payload[key]
+                if type(value) is not str or value != value.strip():
+                    return False
+
+        if "status_updated_at" in payload:
+            status_updated_at = payload["status_updated_at"]
+            if type(status_updated_at) is not str or not status_updated_at or status_updated_at != status_updated_at.strip():
+                return False
+            try:
+                if str(int(float(status_updated_at))) != status_updated_at:
+                    return False
+            except (ValueError, OverflowError):
+                pass
+
+        if "token_failures" in payload:
+            token_failures = payload["token_failures"]
+            if type(token_failures) is not dict:
+                return False
+            if "count" in token_failures and type(token_failures["count"]) is not int:
+                return False
+
+        return True
+
     @staticmethod
     def _normalise_note_value(value: object) -> str | None:
         if value is None:
@@ -844,16 +950,6 @@ class AccountSynchronizer:
         stripped = text.strip()
         return stripped if stripped else None
 
-    @staticmethod
-    def _serialise_tags(tags: object) -> str:
-        if isinstance(tags, list):
-            cleaned = [str(tag).strip() for tag in tags if str(tag).strip()]
-        elif tags is None:
-            cleaned = []
-        else:
-            cleaned = [str(tags).strip()] if str(tags).strip() else []
-        return json.dumps(cleaned, ensure_ascii=False, sort_keys=True)
-
     @staticmethod
     def _deserialise_tags(raw: object) -> list[str]:
         if raw is None or raw == "":
@@ -880,14 +976,15 @@ class AccountSynchronizer:
         return json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
 
     @staticmethod
-    def _checksum(serialised_payload: str | Dict[str, object] | None) -> str | None:
+    def _checksum(serialised_payload: str | Dict[str, object] | None) -> int | None:
         if serialised_payload is None:
             return None
         if isinstance(serialised_payload, str):
             data = serialised_payload
         else:
             data = json.dumps(serialised_payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
-        return sha256(data.encode("utf-8")).hexdigest()
+        # 64 位摘要按有符号整数存入 BIGINT 列
+        return int.from_bytes(blake2b(data.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
 
     def _connect(self) -> "psycopg2.extensions.connection":
         if DATABASE_URL:
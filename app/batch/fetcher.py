@@ -1,40 +1,160 @@
 from __future__ import annotations
 
-import email
+import asyncio
 import imaplib
 import re
 from datetime import datetime
 from email.header import decode_header
 from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from typing import Dict, List
 
 from .config import logger
 from .imap_pool import IMAPConnectionPool
 from .models import AccountCredentials
-from .oauth import get_access_token
+from .oauth import get_access_token, invalidate_access_token
 from app.accounts import account_service
+from app.email.builders import scan_headers
+
+_MSG_ID_PATTERN = re.compile(rb"(\d+)\s+\(")
+_INITIAL_PATTERN = re.compile(r"([A-Za-z])")
+_SEEN_FLAG = b"\\Seen"
+_FETCH_BATCH_SIZE = 100
 
 
 def decode_header_value(header_value: str) -> str:
     if not header_value:
         return ""
+    return _decode_header_text(header_value if isinstance(header_value, str) else str(header_value))
+
 
+# 同一发件人/主题在邮箱中大量重复，缓存解码结果
+@lru_cache(maxsize=8192)
+def _decode_header_text(header_value: str) -> str:
     try:
-        decoded_parts = decode_header(str(header_value))
-        decoded_string = ""
-        for part, charset in decoded_parts:
+        parts: list[str] = []
+        for part, charset in decode_header(header_value):
             if isinstance(part, bytes):
                 try:
-                    encoding = charset if charset else "utf-8"
-                    decoded_string += part.decode(encoding, errors="replace")
-                except (LookupError, UnicodeDecodeError):
-                    decoded_string += part.decode("utf-8", errors="replace")
+                    parts.append(part.decode(charset or "utf-8", errors="replace"))
+                except LookupError:
+                    # 未知字符集按 UTF-8 兜底
+                    parts.append(part.decode("utf-8", errors="replace"))
             else:
-                decoded_string += str(part)
-        return decoded_string.strip()
+                parts.append(part)
+        return "".join(parts).strip()
     except Exception as exc:  # noqa: BLE001
         logger.warning("Failed to decode header value '%s': %s", header_value, exc)
-        return str(header_value) if header_value else ""
+        return header_value
+
+
+def _fetch_and_parse(
+    imap_client: imaplib.IMAP4_SSL,
+    email_id: str,
+    folder_name: str,
+    batches: List[List[bytes]],
+    select_folder: bool,
+) -> List[Dict[str, object]]:
+    if select_folder:
+        imap_client.select(f'"{folder_name}"', readonly=True)
+
+    email_items: List[Dict[str, object]] = []
+    for batch_ids in batches:
+        status, msg_data = imap_client.fetch(
+            b",".join(batch_ids),
+            "(FLAGS BODY.PEEK[HEADER.FIELDS (SUBJECT DATE FROM MESSAGE-ID)])",
+        )
+        if status != "OK":
+            logger.warning("Failed to fetch emails from %s for %s", folder_name, email_id)
+            continue
+
+        responses = iter(msg_data)
+        for head in responses:
+            # 每个邮件响应为 (信封, 头部) 元组，后跟一个 b")" 结束片段
+            if next(responses, None) is None or not isinstance(head, tuple):
+                continue
+
+            envelope, header_data = head[0], head[1]
+
+            match = _MSG_ID_PATTERN.match(envelope)
+            if not match:
+                continue
+            fetched_msg_id = match.group(1)
+
+            headers = scan_headers(header_data)
+            subject = decode_header_value(headers.get("subject", "(No Subject)"))
+            from_email = decode_header_value(headers.get("from", "(Unknown Sender)"))
+            date_str = headers.get("date", "")
+
+            try:
+                date_obj = parsedate_to_datetime(date_str) if date_str else datetime.now()
+                formatted_date = date_obj.isoformat()
+            except Exception:  # noqa: BLE001
+                date_obj = datetime.now()
+                formatted_date = date_obj.isoformat()
+
+            message_id = f"{folder_name}-{fetched_msg_id.decode()}"
+            sender_initial = "?"
+            if from_email:
+                email_match = _INITIAL_PATTERN.search(from_email)
+                if email_match:
+                    sender_initial = email_match.group(1).upper()
+
+            is_read = _SEEN_FLAG in envelope
+
+            email_items.append(
+                {
+                    "email_id": email_id,
+                    "message_id": message_id,
+                    "folder": folder_name,
+                    "subject": subject,
+                    "from_email": from_email,
+                    "date": formatted_date,
+                    "is_read": is_read,
+                    "sender_initial": sender_initial,
+                }
+            )
+    return email_items
+
+
+async def _fetch_folder(
+    imap_pool: IMAPConnectionPool,
+    imap_client: imaplib.IMAP4_SSL,
+    credentials: AccountCredentials,
+    access_token: str,
+    folder_name: str,
+    batches: List[List[bytes]],
+) -> List[Dict[str, object]]:
+    # 额外借用连接，让多个 FETCH 批次在线程池中并发执行
+    clients = [imap_client]
+    try:
+        for _ in range(min(len(batches), imap_pool.max_connections) - 1):
+            try:
+                clients.append(await imap_pool.get_connection(credentials.email, access_token))
+            except Exception as exc:  # noqa: BLE001
+                logger.debug("Failed to acquire extra IMAP connection for %s: %s", credentials.email, exc)
+                break
+
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    None,
+                    _fetch_and_parse,
+                    client,
+                    credentials.email,
+                    folder_name,
+                    batches[index :: len(clients)],
+                    index > 0,
+                )
+                for index, client in enumerate(clients)
+            ]
+        )
+    finally:
+        for client in clients[1:]:
+            await imap_pool.return_connection(credentials.email, client)
+
+    return [item for chunk in results for item in chunk]
 
 
 async def list_emails(imap_pool: IMAPConnectionPool, credentials: AccountCredentials) -> List[Dict[str, object]]:
@@ -52,7 +172,12 @@ async def list_emails(imap_pool: IMAPConnectionPool, credentials: AccountCredent
     imap_client: imaplib.IMAP4_SSL | None = None
 
     try:
-        imap_client = await imap_pool.get_connection(credentials.email, access_token)
+        try:
+            imap_client = await imap_pool.get_connection(credentials.email, access_token)
+        except imaplib.IMAP4.error:
+            # XOAUTH2 认证被拒绝，缓存的访问令牌可能已失效
+            invalidate_access_token(credentials)
+            raise
         folders_to_check = ["INBOX", "Junk"]
 
         for folder_name in folders_to_check:
@@ -66,61 +191,13 @@ async def list_emails(imap_pool: IMAPConnectionPool, credentials: AccountCredent
                 message_ids = messages[0].split()
                 message_ids.reverse()
 
-                for i in range(0, len(message_ids), 100):
-                    batch_ids = message_ids[i : i + 100]
-                    msg_id_sequence = b",".join(batch_ids)
-                    status, msg_data = imap_client.fetch(
-                        msg_id_sequence,
-                        "(FLAGS BODY.PEEK[HEADER.FIELDS (SUBJECT DATE FROM MESSAGE-ID)])",
-                    )
-                    if status != "OK":
-                        logger.warning("Failed to fetch emails from %s for %s", folder_name, credentials.email)
-                        continue
-
-                    for j in range(0, len(msg_data), 2):
-                        if j + 1 >= len(msg_data):
-                            continue
-
-                        header_data = msg_data[j][1]
-
-                        match = re.match(rb"(\d+)\s+\(", msg_data[j][0])
-                        if not match:
-                            continue
-                        fetched_msg_id = match.group(1)
-
-                        msg = email.message_from_bytes(header_data)
-                        subject = decode_header_value(msg.get("Subject", "(No Subject)"))
-                        from_email = decode_header_value(msg.get("From", "(Unknown Sender)"))
-                        date_str = msg.get("Date", "")
-
-                        try:
-                            date_obj = parsedate_to_datetime(date_str) if date_str else datetime.now()
-                            formatted_date = date_obj.isoformat()
-                        except Exception:  # noqa: BLE001
-                            date_obj = datetime.now()
-                            formatted_date = date_obj.isoformat()
-
-                        message_id = f"{folder_name}-{fetched_msg_id.decode()}"
-                        sender_initial = "?"
-                        if from_email:
-                            email_match = re.search(r"([a-zA-Z])", from_email)
-                            if email_match:
-                                sender_initial = email_match.group(1).upper()
-
-                        is_read = b"\\Seen" in msg_data[j][0]
-
-                        email_items.append(
-                            {
-                                "email_id": credentials.email,
-                                "message_id": message_id,
-                                "folder": folder_name,
-                                "subject": subject,
-                                "from_email": from_email,
-                                "date": formatted_date,
-                                "is_read": is_read,
-                                "sender_initial": sender_initial,
-                            }
-                        )
+                batches = [
+                    message_ids[i : i + _FETCH_BATCH_SIZE]
+                    for i in range(0, len(message_ids), _FETCH_BATCH_SIZE)
+                ]
+                email_items.extend(
+                    await _fetch_folder(imap_pool, imap_client, credentials, access_token, folder_name, batches)
+                )
             except Exception as exc:  # noqa: BLE001
                 logger.warning("Failed to fetch emails from %s for %s: %s", folder_name, credentials.email, exc)
                 continue
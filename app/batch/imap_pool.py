@@ -3,15 +3,30 @@ from __future__ import annotations
 import asyncio
 import imaplib
 import socket
-from queue import Empty, Queue
+import time
+from dataclasses import dataclass
 
-from .config import CONNECTION_TIMEOUT, IMAP_PORT, IMAP_SERVER, MAX_CONNECTIONS, SOCKET_TIMEOUT, logger
+from .config import (
+    CONNECTION_IDLE_CHECK_SECONDS,
+    CONNECTION_TIMEOUT,
+    IMAP_PORT,
+    IMAP_SERVER,
+    MAX_CONNECTIONS,
+    SOCKET_TIMEOUT,
+    logger,
+)
+
+
+@dataclass(slots=True)
+class PooledConnection:
+    client: imaplib.IMAP4_SSL
+    last_used: float
 
 
 class IMAPConnectionPool:
     def __init__(self, max_connections: int = MAX_CONNECTIONS) -> None:
         self.max_connections = max_connections
-        self.connections: dict[str, Queue[imaplib.IMAP4_SSL]] = {}
+        self.connections: dict[str, asyncio.Queue[PooledConnection]] = {}
         self.connection_count: dict[str, int] = {}
         self.lock = asyncio.Lock()
         logger.info("Initialized IMAP connection pool with max_connections=%s", max_connections)
@@ -32,43 +47,57 @@ class IMAPConnectionPool:
     async def get_connection(self, email: str, access_token: str) -> imaplib.IMAP4_SSL:
         async with self.lock:
             if email not in self.connections:
-                self.connections[email] = Queue(maxsize=self.max_connections)
+                self.connections[email] = asyncio.Queue(maxsize=self.max_connections)
                 self.connection_count[email] = 0
 
-            connection_queue = self.connections[email]
+        connection_queue = self.connections[email]
 
+        try:
+            pooled = connection_queue.get_nowait()
             try:
-                connection = connection_queue.get_nowait()
-                try:
-                    connection.noop()
-                    logger.debug("Reused existing IMAP connection for %s", email)
-                    return connection
-                except Exception:  # noqa: BLE001
-                    logger.debug("Existing connection invalid for %s, creating new one", email)
+                # 最近用过的连接直接复用，空闲较久才发 NOOP 探测
+                if time.monotonic() - pooled.last_used >= CONNECTION_IDLE_CHECK_SECONDS:
+                    pooled.client.noop()
+                logger.debug("Reused existing IMAP connection for %s", email)
+                return pooled.client
+            except Exception:  # noqa: BLE001
+                logger.debug("Existing connection invalid for %s, creating new one", email)
+                async with self.lock:
                     self.connection_count[email] -= 1
-            except Empty:
-                pass
+        except asyncio.QueueEmpty:
+            pass
 
-            if self.connection_count[email] < self.max_connections:
-                connection = await self._create_connection(email, access_token)
+        async with self.lock:
+            can_create = self.connection_count[email] < self.max_connections
+            if can_create:
+                # 先占用名额，建立连接期间不持有锁
                 self.connection_count[email] += 1
-                return connection
 
-            logger.warning("Max connections (%s) reached for %s, waiting...", self.max_connections, email)
+        if can_create:
             try:
-                return connection_queue.get(timeout=30)
-            except Exception as exc:  # noqa: BLE001
-                logger.error("Timeout waiting for connection for %s: %s", email, exc)
+                return await self._create_connection(email, access_token)
+            except Exception:  # noqa: BLE001
+                async with self.lock:
+                    self.connection_count[email] -= 1
                 raise
 
+        logger.warning("Max connections (%s) reached for %s, waiting...", self.max_connections, email)
+        try:
+            pooled = await asyncio.wait_for(connection_queue.get(), timeout=30)
+            return pooled.client
+        except asyncio.TimeoutError as exc:
+            logger.error("Timeout waiting for connection for %s: %s", email, exc)
+            raise
+
     async def return_connection(self, email: str, connection: imaplib.IMAP4_SSL) -> None:
         if email not in self.connections:
             logger.warning("Attempting to return connection for unknown email: %s", email)
             return
 
         try:
-            connection.noop()
-            self.connections[email].put_nowait(connection)
+            if getattr(connection, "state", "") == "LOGOUT":
+                raise imaplib.IMAP4.abort("connection already logged out")
+            self.connections[email].put_nowait(PooledConnection(connection, time.monotonic()))
             logger.debug("Successfully returned IMAP connection for %s", email)
         except Exception as exc:  # noqa: BLE001
             async with self.lock:
@@ -80,24 +109,26 @@ class IMAPConnectionPool:
         async with self.lock:
             if email:
                 if email in self.connections:
-                    closed_count = 0
-                    while not self.connections[email].empty():
-                        try:
-                            conn = self.connections[email].get_nowait()
-                            conn.logout()
-                            closed_count += 1
-                        except Exception as exc:  # noqa: BLE001
-                            logger.debug("Error closing connection: %s", exc)
-                    self.connection_count[email] = 0
-                    logger.info("Closed %s connections for %s", closed_count, email)
+                    self._close_queue_locked(email)
                 return
 
             total_closed = 0
             for email_key in list(self.connections.keys()):
-                count_before = self.connection_count.get(email_key, 0)
-                await self.close_all_connections(email_key)
-                total_closed += count_before
+                total_closed += self.connection_count.get(email_key, 0)
+                self._close_queue_locked(email_key)
             logger.info("Closed total %s connections for all accounts", total_closed)
 
+    def _close_queue_locked(self, email: str) -> None:
+        connection_queue = self.connections[email]
+        closed_count = 0
+        while not connection_queue.empty():
+            try:
+                connection_queue.get_nowait().client.logout()
+                closed_count += 1
+            except Exception as exc:  # noqa: BLE001
+                logger.debug("Error closing connection: %s", exc)
+        self.connection_count[email] = 0
+        logger.info("Closed %s connections for %s", closed_count, email)
+
 
-__all__ = ["IMAPConnectionPool"]
+__all__ = ["IMAPConnectionPool", "PooledConnection"]
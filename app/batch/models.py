@@ -4,6 +4,8 @@ from typing import List, Optional
 
 
 class AccountCredentials:
+    __slots__ = ("email", "refresh_token", "client_id", "tags")
+
     def __init__(self, email: str, refresh_token: str, client_id: str, tags: Optional[List[str]] = None) -> None:
         self.email = email
         self.refresh_token = refresh_token
@@ -12,6 +14,17 @@ class AccountCredentials:
 
 
 class EmailItem:
+    __slots__ = (
+        "message_id",
+        "folder",
+        "subject",
+        "from_email",
+        "date",
+        "is_read",
+        "has_attachments",
+        "sender_initial",
+    )
+
     def __init__(
         self,
         message_id: str,
@@ -1,12 +1,66 @@
 from __future__ import annotations
 
+import asyncio
+import time
+
 import httpx
 
-from .config import OAUTH_SCOPE, TOKEN_URL, logger
+from .config import MAX_CONNECTIONS, OAUTH_SCOPE, TOKEN_URL, logger
 from .models import AccountCredentials
 
+DEFAULT_TOKEN_TTL_SECONDS = 3600
+TOKEN_EXPIRY_MARGIN_SECONDS = 60
+
+# (client_id, refresh_token) -> (access_token, expires_at)，expires_at 基于 time.monotonic()
+_TOKEN_CACHE: dict[tuple[str, str], tuple[str, float]] = {}
+
+# (client_id, refresh_token) -> 正在进行的令牌请求，并发调用方共享同一个结果
+_INFLIGHT: dict[tuple[str, str], asyncio.Task[str]] = {}
+
+_CLIENT: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            timeout=30.0,
+            proxies=None,
+            limits=httpx.Limits(
+                max_keepalive_connections=MAX_CONNECTIONS,
+                max_connections=MAX_CONNECTIONS * 2,
+            ),
+        )
+    return _CLIENT
+
+
+async def close_token_client() -> None:
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+
+def _cache_key(credentials: AccountCredentials) -> tuple[str, str]:
+    return credentials.client_id, credentials.refresh_token
+
 
 async def get_access_token(credentials: AccountCredentials) -> str:
+    key = _cache_key(credentials)
+    cached = _TOKEN_CACHE.get(key)
+    if cached and time.monotonic() < cached[1] - TOKEN_EXPIRY_MARGIN_SECONDS:
+        return cached[0]
+
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.create_task(_request_access_token(credentials))
+        _INFLIGHT[key] = task
+        task.add_done_callback(lambda _: _INFLIGHT.pop(key, None))
+    # shield：单个调用方被取消时不影响其他等待同一请求的调用方
+    return await asyncio.shield(task)
+
+
+async def _request_access_token(credentials: AccountCredentials) -> str:
     token_request_data = {
         "client_id": credentials.client_id,
         "grant_type": "refresh_token",
@@ -15,16 +69,16 @@ async def get_access_token(credentials: AccountCredentials) -> str:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=30.0, proxies=None) as client:
-            response = await client.post(TOKEN_URL, data=token_request_data)
-            response.raise_for_status()
-            token_data = response.json()
-            access_token = token_data.get("access_token")
-            if not access_token:
-                logger.error("No access token in response for %s", credentials.email)
-                raise ValueError("Failed to obtain access token from response")
-            logger.info("Successfully obtained access token for %s", credentials.email)
-            return access_token
+        response = await _get_client().post(TOKEN_URL, data=token_request_data)
+        response.raise_for_status()
+        token_data = response.json()
+        access_token = token_data.get("access_token")
+        if not access_token:
+            logger.error("No access token in response for %s", credentials.email)
+            raise ValueError("Failed to obtain access token from response")
+        _TOKEN_CACHE[_cache_key(credentials)] = (access_token, time.monotonic() + _parse_expires_in(token_data))
+        logger.debug("Successfully obtained access token for %s", credentials.email)
+        return access_token
     except httpx.HTTPStatusError as exc:  # noqa: BLE001
         error_msg = f"HTTP {exc.response.status_code} error getting access token"
         logger.error("%s for %s: %s", error_msg, credentials.email, exc)
@@ -42,4 +96,16 @@ async def get_access_token(credentials: AccountCredentials) -> str:
         raise
 
 
-__all__ = ["get_access_token"]
+def invalidate_access_token(credentials: AccountCredentials) -> None:
+    """服务端拒绝缓存的令牌时丢弃缓存，下次调用重新刷新"""
+    _TOKEN_CACHE.pop(_cache_key(credentials), None)
+
+
+def _parse_expires_in(token_data: dict[str, object]) -> int:
+    try:
+        return int(token_data.get("expires_in") or DEFAULT_TOKEN_TTL_SECONDS)
+    except (TypeError, ValueError):
+        return DEFAULT_TOKEN_TTL_SECONDS
+
+
+__all__ = ["close_token_client", "get_access_token", "invalidate_access_token"]
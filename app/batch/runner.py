@@ -3,10 +3,12 @@ from __future__ import annotations
 import asyncio
 from datetime import datetime
 
-from .config import logger
+from .config import MAX_CONNECTIONS, logger
 from .fetcher import list_emails
 from .imap_pool import IMAPConnectionPool
-from .storage import ensure_output_directory, get_account_credentials, save_emails
+from .models import AccountCredentials
+from .oauth import close_token_client
+from .storage import build_output_paths, ensure_output_directory, get_account_credentials, save_emails
 
 
 async def run() -> None:
@@ -19,20 +21,33 @@ async def run() -> None:
 
         logger.info("Processing %s accounts", len(accounts))
         imap_pool = IMAPConnectionPool()
-        current_date = datetime.now().strftime("%Y%m%d")
-
-        for email_id, credentials in accounts.items():
-            try:
-                logger.info("Processing account: %s", email_id)
-                emails = await list_emails(imap_pool, credentials)
-                save_emails(email_id, current_date, emails)
-            except Exception as exc:  # noqa: BLE001
-                logger.error("Failed to process account %s: %s", email_id, exc)
-                continue
+        output_paths = build_output_paths(accounts, datetime.now().strftime("%Y%m%d"))
+
+        semaphore = asyncio.Semaphore(MAX_CONNECTIONS)
+        failures = 0
+
+        async def process_account(email_id: str, credentials: AccountCredentials) -> None:
+            nonlocal failures
+            async with semaphore:
+                try:
+                    logger.debug("Processing account: %s", email_id)
+                    emails = await list_emails(imap_pool, credentials)
+                    await save_emails(output_paths[email_id], emails)
+                except Exception as exc:  # noqa: BLE001
+                    failures += 1
+                    logger.error("Failed to process account %s: %s", email_id, exc)
+
+        await asyncio.gather(
+            *(process_account(email_id, credentials) for email_id, credentials in accounts.items()),
+            return_exceptions=True,
+        )
+        logger.info("Processed %s accounts, %s failures", len(accounts) - failures, failures)
 
         await imap_pool.close_all_connections()
     except Exception as exc:  # noqa: BLE001
         logger.error("Error in run function: %s", exc)
+    finally:
+        await close_token_client()
 
 
 def main() -> None:
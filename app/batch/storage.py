@@ -1,23 +1,34 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterable
 
 from .config import ACCOUNTS_FILE, OUTPUT_DIR, OUTPUT_FILE_FORMAT, logger
 from .models import AccountCredentials
 
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# (st_mtime_ns, st_size, credentials)：文件未变化时复用上次解析结果
+_ACCOUNTS_CACHE: tuple[int, int, Dict[str, AccountCredentials]] | None = None
+
 
 async def get_account_credentials() -> Dict[str, AccountCredentials]:
+    global _ACCOUNTS_CACHE
     try:
         accounts_path = Path(ACCOUNTS_FILE)
-        if not accounts_path.exists():
+        try:
+            stat = accounts_path.stat()
+        except FileNotFoundError:
             logger.error("Accounts file %s not found", ACCOUNTS_FILE)
-            raise FileNotFoundError(f"Accounts file {ACCOUNTS_FILE} not found")
+            raise FileNotFoundError(f"Accounts file {ACCOUNTS_FILE} not found") from None
 
-        with accounts_path.open("r", encoding="utf-8") as fh:
-            accounts_data = json.load(fh)
+        if _ACCOUNTS_CACHE and _ACCOUNTS_CACHE[:2] == (stat.st_mtime_ns, stat.st_size):
+            return _ACCOUNTS_CACHE[2]
+
+        accounts_data = json.loads(accounts_path.read_bytes())
 
         credentials: Dict[str, AccountCredentials] = {}
         for email_id, account_info in accounts_data.items():
@@ -33,6 +44,7 @@ async def get_account_credentials() -> Dict[str, AccountCredentials]:
                 tags=account_info.get("tags", []),
             )
 
+        _ACCOUNTS_CACHE = (stat.st_mtime_ns, stat.st_size, credentials)
         logger.info("Loaded %s account(s) from %s", len(credentials), ACCOUNTS_FILE)
         return credentials
     except json.JSONDecodeError as exc:  # noqa: BLE001
@@ -47,15 +59,30 @@ def ensure_output_directory() -> None:
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 
-def save_emails(email_id: str, date_suffix: str, emails: list[dict[str, object]]) -> str:
-    output_file = os.path.join(
-        OUTPUT_DIR,
-        OUTPUT_FILE_FORMAT.format(email_id=email_id.replace("@", "_at_"), date=date_suffix),
-    )
-    with open(output_file, "w", encoding="utf-8") as fh:
-        json.dump(emails, fh, indent=2, ensure_ascii=False)
+def build_output_paths(email_ids: Iterable[str], date_suffix: str) -> Dict[str, Path]:
+    output_dir = Path(OUTPUT_DIR)
+    return {
+        email_id: output_dir / OUTPUT_FILE_FORMAT.format(email_id=email_id.replace("@", "_at_"), date=date_suffix)
+        for email_id in email_ids
+    }
+
+
+async def save_emails(output_file: Path, emails: list[dict[str, object]]) -> Path:
+    # 在线程中写盘，避免阻塞其他账户的并发抓取
+    await asyncio.to_thread(_write_emails, output_file, emails)
     logger.info("Saved %s emails to %s", len(emails), output_file)
     return output_file
 
 
-__all__ = ["ensure_output_directory", "get_account_credentials", "save_emails"]
+def _write_emails(output_file: Path, emails: list[dict[str, object]]) -> None:
+    # 逐条编码写入：不带 indent 时 json 使用 C 编码器，且无需在内存中拼出整个文档
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    with open(output_file, "wb", buffering=_WRITE_BUFFER_SIZE) as fh:
+        fh.write(b"[")
+        for index, item in enumerate(emails):
+            fh.write(b",\n  " if index else b"\n  ")
+            fh.write(encode(item).encode("utf-8"))
+        fh.write(b"\n]" if emails else b"]")
+
+
+__all__ = ["build_output_paths", "ensure_output_directory", "get_account_credentials", "save_emails"]
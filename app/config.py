@@ -32,6 +32,16 @@ IMAP_PORT = 993
 MAX_CONNECTIONS = 5
 CONNECTION_TIMEOUT = 30
 SOCKET_TIMEOUT = 15
+# 池中连接空闲超过该时长才在取用前发送 NOOP 探测
+CONNECTION_IDLE_CHECK_SECONDS = 60
+# 阻塞式 IMAP 调用使用独立线程池，避免占满默认线程池
+IMAP_WORKER_THREADS = int(os.getenv("IMAP_WORKER_THREADS", "32"))
+# 默认线程池及 AnyIO 线程令牌上限（缓存读取、同步路由等短任务）
+DEFAULT_THREAD_LIMIT = int(os.getenv("DEFAULT_THREAD_LIMIT", "200"))
+
+# 启动时为前 N 个有效账户预建 IMAP 连接（0 表示关闭），每个账户预建的连接数
+IMAP_WARMUP_ACCOUNTS = int(os.getenv("IMAP_WARMUP_ACCOUNTS", "0"))
+IMAP_WARMUP_CONNECTIONS = int(os.getenv("IMAP_WARMUP_CONNECTIONS", "2"))
 
 CACHE_EXPIRE_TIME = 60
 
@@ -42,10 +52,14 @@ APP_USERNAME = os.getenv("APP_USERNAME", "admin")
 APP_PASSWORD = os.getenv("APP_PASSWORD", "admin")
 LOCK_THRESHOLD = 5
 LOCK_DURATION_SECONDS = 3600
+# API Key 长度上限（公开的固定值，不随实际 Key 变化）
+API_KEY_MAX_LENGTH = 256
 
 # 令牌失败阈值配置
 TOKEN_FAILURE_THRESHOLD = int(os.getenv("TOKEN_FAILURE_THRESHOLD", "8"))
 TOKEN_FAILURE_WINDOW_HOURS = int(os.getenv("TOKEN_FAILURE_WINDOW_HOURS", "12"))
+# 令牌健康检查同时进行的刷新请求数
+TOKEN_CHECK_CONCURRENCY = int(os.getenv("TOKEN_CHECK_CONCURRENCY", "16"))
 
 logging.basicConfig(
     level=logging.INFO,
@@ -12,7 +12,7 @@ from fastapi import HTTPException
 from app.accounts import account_service
 from app.accounts.credentials import get_account_credentials
 from app.accounts.repository import AccountRepository
-from app.config import logger
+from app.config import TOKEN_CHECK_CONCURRENCY, logger
 from app.oauth import fetch_access_token
 
 
@@ -34,31 +34,63 @@ class TokenHealthStatus:
     last_started_at: float | None = None
     last_completed_at: float | None = None
     last_result: TokenHealthResult | None = None
+    progress: TokenHealthResult | None = None
 
 
 class TokenHealthService:
     def __init__(self, repository: AccountRepository) -> None:
         self._repository = repository
 
-    async def run_once(self) -> TokenHealthResult:
-        result = TokenHealthResult()
+    async def run_once(self, progress: TokenHealthResult | None = None) -> TokenHealthResult:
+        result = progress if progress is not None else TokenHealthResult()
         accounts = self._repository.read_all()
         if not accounts:
             logger.info("Token health check skipped: no accounts available")
             return result
 
-        for email in accounts.keys():
-            result.total += 1
-            try:
-                credentials = get_account_credentials(self._repository, email, accounts=accounts)
-            except HTTPException as exc:
-                logger.warning("Skipping token check for %s: %s", email, exc.detail)
+        result.total = len(accounts)
+        semaphore = asyncio.Semaphore(max(1, TOKEN_CHECK_CONCURRENCY))
+        checks = [self._check_one(email, accounts, semaphore) for email in accounts.keys()]
+        # 每完成一个账户即合并结果，状态接口可以看到进度
+        for next_check in asyncio.as_completed(checks):
+            outcome = await next_check
+            if outcome is None:
                 continue
+            succeeded, newly_expired = outcome
+            if succeeded:
+                result.success += 1
+            else:
+                result.failures += 1
+            if newly_expired:
+                result.newly_expired += 1
+
+        logger.info(
+            "Token health check completed: total=%s success=%s failures=%s newly_expired=%s",
+            result.total,
+            result.success,
+            result.failures,
+            result.newly_expired,
+        )
+        return result
+
+    async def _check_one(
+        self,
+        email: str,
+        accounts: dict[str, dict[str, object]],
+        semaphore: asyncio.Semaphore,
+    ) -> tuple[bool, bool] | None:
+        """返回 (是否成功, 是否新过期)；无法构造凭据时返回 None"""
+        try:
+            credentials = get_account_credentials(self._repository, email, accounts=accounts)
+        except HTTPException as exc:
+            logger.warning("Skipping token check for %s: %s", email, exc.detail)
+            return None
 
+        async with semaphore:
             try:
-                await fetch_access_token(credentials)
+                await fetch_access_token(credentials, force_refresh=True)
                 account_service.record_token_success(email)
-                result.success += 1
+                return True, False
             except HTTPException as exc:
                 status_code = exc.status_code
                 account_service.record_token_failure(
@@ -67,9 +99,7 @@ class TokenHealthService:
                     error_message=exc.detail,
                     operation="token_health_check"
                 )
-                if status_code == 401:
-                    result.newly_expired += 1
-                result.failures += 1
+                return False, status_code == 401
             except Exception as exc:  # noqa: BLE001
                 logger.error("Unexpected error checking token for %s: %s", email, exc)
                 account_service.record_token_failure(
@@ -77,16 +107,7 @@ class TokenHealthService:
                     error_message=str(exc),
                     operation="token_health_check"
                 )
-                result.failures += 1
-
-        logger.info(
-            "Token health check completed: total=%s success=%s failures=%s newly_expired=%s",
-            result.total,
-            result.success,
-            result.failures,
-            result.newly_expired,
-        )
-        return result
+                return False, False
 
 
 class TokenHealthScheduler:
@@ -161,26 +182,27 @@ class TokenHealthScheduler:
             return
 
     async def _wait_with_trigger(self, timeout: float) -> None:
+        waiters = {
+            asyncio.create_task(self._stop_event.wait()),
+            asyncio.create_task(self._trigger_event.wait()),
+        }
         try:
-            done, _ = await asyncio.wait(
-                [
-                    asyncio.create_task(self._stop_event.wait()),
-                    asyncio.create_task(self._trigger_event.wait()),
-                ],
-                timeout=timeout,
-                return_when=asyncio.FIRST_COMPLETED,
-            )
-            for task in done:
-                task.result()
-        except asyncio.TimeoutError:
-            return
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            # 取消未完成的等待任务，避免每个周期遗留挂起的 Event.wait()
+            pending = [task for task in waiters if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
     async def _run_once_with_status(self) -> None:
         self._status.running = True
         self._status.last_started_at = time.time()
+        self._status.progress = TokenHealthResult()
         try:
-            result = await self._service.run_once()
+            result = await self._service.run_once(self._status.progress)
             self._status.last_result = result
         finally:
             self._status.running = False
+            self._status.progress = None
             self._status.last_completed_at = time.time()
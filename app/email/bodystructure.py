@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import binascii
+import re
+from typing import Dict, List, NamedTuple, Tuple
+
+# FETCH 响应的词法单元：括号、带引号字符串、原子（含 BODY[1.2] 这类带方括号的名称）
+_TOKEN_PATTERN = re.compile(rb'\(|\)|"(?:[^"\\]|\\.)*"|[^\s()"]+')
+_LITERAL_SUFFIX = re.compile(rb"\{(\d+)\}$")
+_QUOTED_ESCAPE = re.compile(r"\\(.)")
+
+
+class TextPart(NamedTuple):
+    section: str
+    content_type: str
+    encoding: str
+    charset: str
+
+
+def _tokenize(msg_data: List[Tuple[bytes, bytes] | bytes]) -> List[object]:
+    tokens: List[object] = []
+    for entry in msg_data:
+        if isinstance(entry, tuple):
+            prefix, literal = entry[0], entry[1]
+            match = _LITERAL_SUFFIX.search(prefix)
+            if match:
+                prefix = prefix[: match.start()]
+            tokens.extend(_TOKEN_PATTERN.findall(prefix))
+            # 字面量按原样保留为 bytes，与普通词法单元区分
+            tokens.append(bytearray(literal))
+        elif isinstance(entry, (bytes, bytearray)):
+            tokens.extend(_TOKEN_PATTERN.findall(bytes(entry)))
+    return tokens
+
+
+def _build_tree(tokens: List[object]) -> List[object]:
+    root: List[object] = []
+    stack = [root]
+    for token in tokens:
+        if isinstance(token, bytearray):
+            stack[-1].append(bytes(token))
+        elif token == b"(":
+            child: List[object] = []
+            stack[-1].append(child)
+            stack.append(child)
+        elif token == b")":
+            if len(stack) > 1:
+                stack.pop()
+        elif token.startswith(b'"'):
+            stack[-1].append(_QUOTED_ESCAPE.sub(r"\1", token[1:-1].decode("utf-8", errors="replace")))
+        elif token.upper() == b"NIL":
+            stack[-1].append(None)
+        else:
+            stack[-1].append(token.decode("ascii", errors="replace"))
+    return root
+
+
+def parse_fetch_items(msg_data: List[Tuple[bytes, bytes] | bytes]) -> Dict[str, object]:
+    """把 FETCH 响应解析为 {数据项名称: 值}；多条响应合并，同名项取第一个"""
+    items: Dict[str, object] = {}
+    for node in _build_tree(_tokenize(msg_data)):
+        if not isinstance(node, list):
+            continue
+        for index in range(0, len(node) - 1, 2):
+            name = node[index]
+            if isinstance(name, str):
+                items.setdefault(name.upper(), node[index + 1])
+    return items
+
+
+def _text(value: object) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return value if isinstance(value, str) else ""
+
+
+def _walk(node: List[object], section: str, parts: List[TextPart]) -> None:
+    if node and isinstance(node[0], list):
+        children = []
+        for child in node:
+            if not isinstance(child, list):
+                break
+            children.append(child)
+        for number, child in enumerate(children, 1):
+            _walk(child, f"{section}.{number}" if section else str(number), parts)
+        return
+
+    if len(node) < 7:
+        return
+    main_type, sub_type = _text(node[0]).lower(), _text(node[1]).lower()
+    if main_type == "message" and sub_type == "rfc822":
+        # 与 Message.walk() 一致，继续进入内嵌邮件的各个部分
+        if len(node) > 8 and isinstance(node[8], list) and node[8]:
+            inner = node[8]
+            _walk(inner, section if isinstance(inner[0], list) else f"{section}.1", parts)
+        return
+    if main_type != "text" or sub_type not in ("plain", "html"):
+        return
+
+    disposition = node[9] if len(node) > 9 else None
+    if isinstance(disposition, list) and disposition and "attachment" in _text(disposition[0]).lower():
+        return
+    params = node[2] if isinstance(node[2], list) else []
+    charset = ""
+    for index in range(0, len(params) - 1, 2):
+        if _text(params[index]).lower() == "charset":
+            charset = _text(params[index + 1])
+            break
+    parts.append(TextPart(section or "1", f"text/{sub_type}", _text(node[5]).lower(), charset or "utf-8"))
+
+
+def find_text_parts(structure: object) -> List[TextPart] | None:
+    """列出多部分邮件中非附件的 text/plain 与 text/html 部分（按遍历顺序）；非多部分邮件返回 None"""
+    if not isinstance(structure, list) or not structure or not isinstance(structure[0], list):
+        return None
+    parts: List[TextPart] = []
+    _walk(structure, "", parts)
+    return parts
+
+
+def decode_part(data: bytes, part: TextPart) -> str:
+    if part.encoding == "base64":
+        payload = binascii.a2b_base64(data)
+    elif part.encoding == "quoted-printable":
+        payload = binascii.a2b_qp(data)
+    else:
+        payload = data
+    try:
+        return payload.decode(part.charset, errors="replace")
+    except LookupError:
+        return payload.decode("utf-8", errors="replace")
+
+
+__all__ = ["TextPart", "decode_part", "find_text_parts", "parse_fetch_items"]
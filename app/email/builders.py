@@ -1,26 +1,72 @@
 from __future__ import annotations
 
-import email
 import re
 from typing import Dict, List, Tuple
 
 from app.email.utils import decode_header_value, extract_sender_initial, format_date
 from app.models import EmailItem
 
-_HEADER_ID_PATTERN = re.compile(rb"(\d+)\s+\(")
+_WANTED_HEADERS = frozenset({"subject", "date", "from", "message-id"})
+_UID_PATTERN = re.compile(rb"UID\s+(\d+)")
 
 
-def parse_headers(msg_data: List[Tuple[bytes, bytes]]) -> Dict[bytes, bytes]:
+def _extract_id(header: bytes) -> bytes | None:
+    # FETCH 响应头形如 b"12 (BODY[...] {345}"：取首个空格前的序号
+    sp = header.find(b" ")
+    if sp <= 0:
+        return None
+    msg_id = header[:sp]
+    return msg_id if msg_id.isdigit() else None
+
+
+def scan_headers(header_data: bytes) -> Dict[str, str]:
+    """只提取列表需要的几个头字段，不构建 email.message 对象"""
+    headers: Dict[str, str] = {}
+    current: str | None = None
+    # 只按 LF 切分：str.splitlines() 还会在 \x1c、\x85、\u2028 等字符处断行，截断头字段值
+    for raw_line in header_data.split(b"\n"):
+        if raw_line.endswith(b"\r"):
+            raw_line = raw_line[:-1]
+        if not raw_line:
+            break
+        line = raw_line.decode("utf-8", errors="replace")
+        if line[0] in " \t":
+            # 折行：续接到上一个需要的头字段
+            if current is not None:
+                headers[current] += line.rstrip()
+            continue
+        name, sep, value = line.partition(":")
+        current = name.strip().lower()
+        if not sep or current not in _WANTED_HEADERS or current in headers:
+            current = None
+            continue
+        headers[current] = value.strip()
+    return headers
+
+
+def parse_headers(
+    msg_data: List[Tuple[bytes, bytes] | bytes],
+    uid_lookup: Dict[bytes, str] | None = None,
+) -> Dict[bytes, bytes]:
+    """解析 FETCH 响应；传入 uid_lookup 时顺带收集同一响应中的 UID"""
     parsed: Dict[bytes, bytes] = {}
-    for entry in msg_data:
+    for index, entry in enumerate(msg_data):
         if not isinstance(entry, tuple) or len(entry) < 2:
             continue
         header, content = entry[0], entry[1]
-        match = _HEADER_ID_PATTERN.match(header)
-        if not match:
+        msg_id = _extract_id(header)
+        if msg_id is None:
             continue
-        msg_id = match.group(1)
         parsed[msg_id] = content
+        if uid_lookup is not None:
+            match = _UID_PATTERN.search(header)
+            if match is None and index + 1 < len(msg_data):
+                # 部分服务器把 UID 放在字面量之后的结尾片段里，如 b" UID 123)"
+                trailer = msg_data[index + 1]
+                if isinstance(trailer, (bytes, bytearray)):
+                    match = _UID_PATTERN.search(trailer)
+            if match:
+                uid_lookup[msg_id] = match.group(1).decode()
     return parsed
 
 
@@ -29,31 +75,32 @@ def build_email_items(
     messages: Dict[bytes, bytes],
     uid_lookup: Dict[bytes, str] | None = None,
 ) -> List[EmailItem]:
-    items: List[EmailItem] = []
     uid_lookup = uid_lookup or {}
-    for msg_id, header_data in messages.items():
-        msg = email.message_from_bytes(header_data)
-        subject = decode_header_value(msg.get("Subject", "(No Subject)"))
-        from_email = decode_header_value(msg.get("From", "(Unknown Sender)"))
-        date_str = msg.get("Date", "")
-        formatted_date = format_date(date_str)
-        message_id = f"{folder_name}-{msg_id.decode()}"
-        sender_initial = extract_sender_initial(from_email)
-        uid_value = uid_lookup.get(msg_id)
-        items.append(
-            EmailItem(
-                message_id=message_id,
-                folder=folder_name,
-                subject=subject,
-                from_email=from_email,
-                date=formatted_date,
-                is_read=False,
-                has_attachments=False,
-                sender_initial=sender_initial,
-                uid=uid_value,
-            )
+    # 条目数已知，一次分配好列表再按下标填充，避免增长时反复扩容
+    items: List[EmailItem] = [None] * len(messages)  # type: ignore[list-item]
+    for index, (msg_id, header_data) in enumerate(messages.items()):
+        items[index] = _build_email_item(
+            folder_name, msg_id, scan_headers(header_data), uid_lookup.get(msg_id)
         )
     return items
 
 
-__all__ = ["build_email_items", "parse_headers"]
+def _build_email_item(
+    folder_name: str, msg_id: bytes, headers: Dict[str, str], uid_value: str | None
+) -> EmailItem:
+    from_email = decode_header_value(headers.get("from", "(Unknown Sender)"))
+    # 各字段均由本模块生成，类型已确定，无需再走校验
+    return EmailItem.model_construct(
+        message_id=f"{folder_name}-{msg_id.decode()}",
+        folder=folder_name,
+        subject=decode_header_value(headers.get("subject", "(No Subject)")),
+        from_email=from_email,
+        date=format_date(headers.get("date", "")),
+        is_read=False,
+        has_attachments=False,
+        sender_initial=extract_sender_initial(from_email),
+        uid=uid_value,
+    )
+
+
+__all__ = ["build_email_items", "parse_headers", "scan_headers"]
@@ -2,18 +2,29 @@ from __future__ import annotations
 
 import threading
 import time
-from typing import Any
+from collections import OrderedDict
+from typing import Any, Hashable, Tuple
 
 from app.config import CACHE_EXPIRE_TIME
 
 
+# 键为元组，首元素固定为账户邮箱，便于按账户清理
+CacheKey = Tuple[Hashable, ...]
+
+DEFAULT_MAX_ENTRIES = 10_000
+
+
 class EmailCache:
-    def __init__(self, expire_seconds: int = CACHE_EXPIRE_TIME) -> None:
-        self._store: dict[str, tuple[Any, float]] = {}
+    def __init__(self, expire_seconds: int = CACHE_EXPIRE_TIME, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        # 按最近使用排序，超出容量时淘汰最久未用的条目
+        self._store: OrderedDict[CacheKey, tuple[Any, float]] = OrderedDict()
+        # 账户邮箱 -> 该账户的全部键，清理单个账户时无需扫描整个缓存
+        self._keys_by_account: dict[Hashable, set[CacheKey]] = {}
         self._expire_seconds = expire_seconds
+        self._max_entries = max_entries
         self._lock = threading.Lock()
 
-    def get(self, key: str, force_refresh: bool = False) -> Any | None:
+    def get(self, key: CacheKey, force_refresh: bool = False) -> Any | None:
         if force_refresh:
             self.invalidate(key)
             return None
@@ -24,30 +35,65 @@ class EmailCache:
                 return None
             data, timestamp = cached
             if time.time() - timestamp >= self._expire_seconds:
-                self._store.pop(key, None)
+                self._remove_locked(key)
                 return None
+            self._store.move_to_end(key)
             return data
 
-    def set(self, key: str, data: Any) -> None:
+    def get_allow_stale(self, key: CacheKey, stale_seconds: float) -> tuple[Any | None, bool]:
+        """过期后 stale_seconds 内仍返回旧值，并以第二个返回值标记为陈旧，由调用方决定后台刷新"""
+        with self._lock:
+            cached = self._store.get(key)
+            if not cached:
+                return None, False
+            data, timestamp = cached
+            age = time.time() - timestamp
+            if age >= self._expire_seconds + stale_seconds:
+                self._remove_locked(key)
+                return None, False
+            self._store.move_to_end(key)
+            return data, age >= self._expire_seconds
+
+    def set(self, key: CacheKey, data: Any) -> None:
         with self._lock:
             self._store[key] = (data, time.time())
+            self._store.move_to_end(key)
+            self._keys_by_account.setdefault(key[0], set()).add(key)
+            while len(self._store) > self._max_entries:
+                self._remove_locked(next(iter(self._store)))
 
-    def invalidate(self, key: str) -> None:
+    def invalidate(self, key: CacheKey) -> None:
         with self._lock:
-            self._store.pop(key, None)
+            self._remove_locked(key)
 
-    def clear(self, prefix: str | None = None) -> int:
+    def clear(self, account: str | None = None) -> int:
         with self._lock:
-            if prefix is None:
+            if account is None:
                 count = len(self._store)
                 self._store.clear()
+                self._keys_by_account.clear()
                 return count
-            keys = [key for key in self._store if key.startswith(prefix)]
+            keys = self._keys_by_account.pop(account, set())
             for key in keys:
                 self._store.pop(key, None)
             return len(keys)
 
+    def _remove_locked(self, key: CacheKey) -> None:
+        if self._store.pop(key, None) is None:
+            return
+        account_keys = self._keys_by_account.get(key[0])
+        if account_keys is not None:
+            account_keys.discard(key)
+            if not account_keys:
+                del self._keys_by_account[key[0]]
+
+
+FOLDER_SIZE_CACHE_EXPIRE_SECONDS = 30
+# 列表缓存过期后仍可先返回旧结果的时间窗口，期间在后台刷新
+EMAIL_CACHE_STALE_SECONDS = 240
 
 email_cache = EmailCache()
+# (email, folder) -> 文件夹邮件数，翻页时无需重复 SELECT
+folder_size_cache = EmailCache(expire_seconds=FOLDER_SIZE_CACHE_EXPIRE_SECONDS)
 
-__all__ = ["EmailCache", "email_cache"]
+__all__ = ["EMAIL_CACHE_STALE_SECONDS", "EmailCache", "email_cache", "folder_size_cache"]
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-import json
+import atexit
 import re
 import threading
-from hashlib import sha256
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import blake2b
+from typing import Dict, Iterable, List, Optional
 
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
+from pydantic import TypeAdapter
 
 from app.config import (
     ACCOUNTS_DB_HOST,
@@ -22,6 +25,56 @@ from app.config import (
 )
 from app.models import EmailDetailsResponse, EmailItem, EmailListResponse
 
+# 列表缓存负载 {"emails": [...]}：由 pydantic-core 直接编解码，无需经过 dict 与 json 模块
+_LIST_PAYLOAD_ADAPTER = TypeAdapter(Dict[str, List[EmailItem]])
+_DETAIL_PAYLOAD_ADAPTER = TypeAdapter(EmailDetailsResponse)
+
+_POOL_MAX_CONNECTIONS = 10
+_POOL_CHECKOUT_TIMEOUT = 30
+_pool: ThreadedConnectionPool | None = None
+_pool_lock = threading.Lock()
+# ThreadedConnectionPool 在连接用尽时直接抛出 PoolError，这里用信号量让取连接排队等待
+_pool_slots = threading.BoundedSemaphore(_POOL_MAX_CONNECTIONS)
+
+# 缓存写入是尽力而为的，交给后台线程执行，请求无需等待序列化与数据库往返
+_cache_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cache-writer")
+atexit.register(_cache_executor.shutdown, wait=True)
+
+
+def _get_pool() -> ThreadedConnectionPool:
+    """列表与详情缓存共用的连接池，首次使用时创建，避免每次操作都重新握手"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                if DATABASE_URL:
+                    _pool = ThreadedConnectionPool(1, _POOL_MAX_CONNECTIONS, DATABASE_URL, sslmode="require")
+                else:
+                    _pool = ThreadedConnectionPool(
+                        1,
+                        _POOL_MAX_CONNECTIONS,
+                        host=ACCOUNTS_DB_HOST,
+                        port=ACCOUNTS_DB_PORT,
+                        user=ACCOUNTS_DB_USER,
+                        password=ACCOUNTS_DB_PASSWORD,
+                        database=ACCOUNTS_DB_NAME,
+                        sslmode="require",
+                    )
+    return _pool
+
+
+def _submit_write(func, *args) -> None:
+    try:
+        _cache_executor.submit(func, *args)
+    except RuntimeError as exc:
+        # 进程退出时执行器已关闭，丢弃这次写入
+        logger.debug("Skip cache write during shutdown: %s", exc)
+
+
+def _checksum(payload: bytes) -> int:
+    """只用于变更检测，64 位摘要按有符号整数存入 BIGINT 列"""
+    return int.from_bytes(blake2b(payload, digest_size=8).digest(), "big", signed=True)
+
 
 class _BaseCacheRepository:
     _TABLE_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_]+$")
@@ -30,12 +83,14 @@ class _BaseCacheRepository:
         self._table_name = self._normalise_table_name(table_name, default_name)
         self._schema_ready = False
         self._schema_lock = threading.Lock()
+        # 配置在进程生命周期内不变，构造时计算一次
+        self._is_enabled = bool(DATABASE_URL) or all(
+            [ACCOUNTS_DB_HOST, ACCOUNTS_DB_USER, ACCOUNTS_DB_PASSWORD, ACCOUNTS_DB_NAME]
+        )
 
     @property
     def is_enabled(self) -> bool:
-        if DATABASE_URL:
-            return True
-        return all([ACCOUNTS_DB_HOST, ACCOUNTS_DB_USER, ACCOUNTS_DB_PASSWORD, ACCOUNTS_DB_NAME])
+        return self._is_enabled
 
     def _ensure_schema(self, connection: "psycopg2.extensions.connection") -> None:
         if self._schema_ready:
@@ -49,16 +104,20 @@ class _BaseCacheRepository:
             self._schema_ready = True
 
     def _connect(self) -> "psycopg2.extensions.connection":
-        if DATABASE_URL:
-            return psycopg2.connect(DATABASE_URL, sslmode="require")
-        return psycopg2.connect(
-            host=ACCOUNTS_DB_HOST,
-            port=ACCOUNTS_DB_PORT,
-            user=ACCOUNTS_DB_USER,
-            password=ACCOUNTS_DB_PASSWORD,
-            database=ACCOUNTS_DB_NAME,
-            sslmode="require",
-        )
+        if not _pool_slots.acquire(timeout=_POOL_CHECKOUT_TIMEOUT):
+            raise TimeoutError("Timed out waiting for a cache database connection")
+        try:
+            return _get_pool().getconn()
+        except BaseException:
+            _pool_slots.release()
+            raise
+
+    def _release(self, connection: "psycopg2.extensions.connection") -> None:
+        # 已断开的连接直接丢弃，池会在下次取用时重新建立
+        try:
+            _get_pool().putconn(connection, close=bool(connection.closed))
+        finally:
+            _pool_slots.release()
 
     def _normalise_table_name(self, name: str | None, default: str) -> str:
         if name and self._TABLE_NAME_PATTERN.match(name):
@@ -70,6 +129,32 @@ class _BaseCacheRepository:
     def _create_schema(self, cursor: "psycopg2.extensions.cursor") -> None:
         raise NotImplementedError
 
+    def _migrate_legacy_columns(self, cursor: "psycopg2.extensions.cursor") -> None:
+        cursor.execute(
+            """
+            SELECT column_name, data_type FROM information_schema.columns
+            WHERE table_name = %s AND column_name IN ('payload', 'checksum')
+            """,
+            (self._table_name,),
+        )
+        column_types = dict(cursor.fetchall())
+        if column_types.get("payload", "bytea") != "bytea":
+            # 旧表的 payload 为 TEXT，按 UTF-8 原样转为 BYTEA
+            cursor.execute(
+                f"""
+                ALTER TABLE "{self._table_name}"
+                ALTER COLUMN payload TYPE BYTEA USING convert_to(payload, 'UTF8')
+                """
+            )
+        if column_types.get("checksum", "bigint") != "bigint":
+            # 旧表的 SHA-256 十六进制校验和置零（保留 NULL），下次写入时重新计算
+            cursor.execute(
+                f"""
+                ALTER TABLE "{self._table_name}"
+                ALTER COLUMN checksum TYPE BIGINT USING CASE WHEN checksum IS NULL THEN NULL ELSE 0 END
+                """
+            )
+
 
 class EmailListCacheRepository(_BaseCacheRepository):
     def __init__(self) -> None:
@@ -91,11 +176,19 @@ class EmailListCacheRepository(_BaseCacheRepository):
             logger.debug("Skip list cache for %s %s:%s because of missing UID", email_id, folder, page)
             return
 
-        payload = {
-            "emails": [item.model_dump() for item in emails],
-        }
-        payload_json = json.dumps(payload, ensure_ascii=False, sort_keys=True)
-        checksum = sha256(payload_json.encode("utf-8")).hexdigest()
+        _submit_write(self._save_impl, email_id, folder, page, page_size, emails, total_emails)
+
+    def _save_impl(
+        self,
+        email_id: str,
+        folder: str,
+        page: int,
+        page_size: int,
+        emails: list[EmailItem],
+        total_emails: int,
+    ) -> None:
+        payload_bytes = _LIST_PAYLOAD_ADAPTER.dump_json({"emails": emails})
+        checksum = _checksum(payload_bytes)
 
         try:
             connection = self._connect()
@@ -116,15 +209,17 @@ class EmailListCacheRepository(_BaseCacheRepository):
                         payload = EXCLUDED.payload,
                         checksum = EXCLUDED.checksum,
                         synced_at = CURRENT_TIMESTAMP
+                    WHERE "{self._table_name}".checksum IS DISTINCT FROM EXCLUDED.checksum
+                        OR "{self._table_name}".total_emails IS DISTINCT FROM EXCLUDED.total_emails
                     """,
-                    (email_id, folder, page, page_size, total_emails, payload_json, checksum),
+                    (email_id, folder, page, page_size, total_emails, payload_bytes, checksum),
                 )
             connection.commit()
         except Exception as exc:  # noqa: BLE001
             connection.rollback()
             logger.warning("Failed to persist list cache for %s %s:%s: %s", email_id, folder, page, exc)
         finally:
-            connection.close()
+            self._release(connection)
 
     def load(
         self,
@@ -160,15 +255,15 @@ class EmailListCacheRepository(_BaseCacheRepository):
             logger.warning("Failed to read list cache for %s %s:%s: %s", email_id, folder, page, exc)
             return None
         finally:
-            connection.close()
+            self._release(connection)
 
         if not row or not row.get("payload"):
             return None
 
         try:
-            payload = json.loads(row["payload"])
-            emails = [EmailItem.model_validate(item) for item in payload.get("emails", [])]
-            response = EmailListResponse(
+            payload = _LIST_PAYLOAD_ADAPTER.validate_json(bytes(row["payload"]))
+            emails = payload.get("emails", [])
+            response = EmailListResponse.model_construct(
                 email_id=email_id,
                 folder_view=folder,
                 page=page,
@@ -191,19 +286,16 @@ class EmailListCacheRepository(_BaseCacheRepository):
                 page INTEGER NOT NULL,
                 page_size INTEGER NOT NULL,
                 total_emails INTEGER NOT NULL,
-                payload TEXT NOT NULL,
-                checksum CHAR(64) NOT NULL,
+                payload BYTEA NOT NULL,
+                checksum BIGINT NOT NULL,
                 synced_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
                 PRIMARY KEY (email_id, folder, page, page_size)
             )
             """
         )
-        cursor.execute(
-            f"""
-            CREATE INDEX IF NOT EXISTS "idx_{self._table_name}_email_folder"
-            ON "{self._table_name}" (email_id, folder)
-            """
-        )
+        self._migrate_legacy_columns(cursor)
+        # 主键 (email_id, folder, page, page_size) 的前缀已覆盖该查询，多余索引只会放大写入
+        cursor.execute(f'DROP INDEX IF EXISTS "idx_{self._table_name}_email_folder"')
 
 
 class CachedEmailDetail:
@@ -218,11 +310,26 @@ class CachedEmailDetail:
 class EmailDetailCacheRepository(_BaseCacheRepository):
     def __init__(self) -> None:
         super().__init__(EMAIL_DETAIL_CACHE_TABLE, "email_detail_cache")
+        # 两种查找方式各自对应固定的 SQL，表名在构造后不再变化
+        select_prefix = f'SELECT folder, uid, payload FROM "{self._table_name}" WHERE email_id = %s'
+        self._sql_by_message_id = f"{select_prefix} AND message_id = %s"
+        self._sql_by_uid = f"{select_prefix} AND folder = %s AND uid = %s"
 
     def register_stub(self, email_id: str, message_id: str, folder: str, uid: str | None) -> None:
-        if not self.is_enabled or not uid:
+        self.register_stubs(email_id, [(message_id, folder, uid)])
+
+    def register_stubs(self, email_id: str, stubs: Iterable[tuple[str, str, str | None]]) -> None:
+        """批量登记 (message_id, folder, uid)，一次往返写入整页列表"""
+        if not self.is_enabled:
             return
-        self._write_record(email_id, message_id, folder, uid, payload=None, checksum=None)
+        # 同一语句内重复的主键会触发 ON CONFLICT 错误，按 message_id 去重
+        records = {
+            message_id: (message_id, folder, uid, None, None)
+            for message_id, folder, uid in stubs
+            if uid
+        }
+        if records:
+            _submit_write(self._write_records, email_id, list(records.values()))
 
     def save_detail(
         self,
@@ -237,25 +344,50 @@ class EmailDetailCacheRepository(_BaseCacheRepository):
         if not uid:
             logger.debug("Skip detail cache for %s %s because UID missing", email_id, message_id)
             return
-        payload_json = json.dumps(detail.model_dump(), ensure_ascii=False, sort_keys=True)
-        checksum = sha256(payload_json.encode("utf-8")).hexdigest()
-        self._write_record(email_id, message_id, folder, uid, payload=payload_json, checksum=checksum)
+        _submit_write(self._save_detail_impl, email_id, message_id, folder, uid, detail)
+
+    def _save_detail_impl(
+        self,
+        email_id: str,
+        message_id: str,
+        folder: str,
+        uid: str,
+        detail: EmailDetailsResponse,
+    ) -> None:
+        payload_bytes = _DETAIL_PAYLOAD_ADAPTER.dump_json(detail)
+        checksum = _checksum(payload_bytes)
+        self._write_records(email_id, [(message_id, folder, uid, payload_bytes, checksum)])
 
     def load(self, email_id: str, message_id: str) -> CachedEmailDetail | None:
-        return self._read_record(email_id=email_id, message_id=message_id, uid=None, folder=None)
+        return self._read_by_message_id(email_id, message_id)
 
     def load_by_uid(self, email_id: str, folder: str, uid: str) -> CachedEmailDetail | None:
-        return self._read_record(email_id=email_id, message_id=None, uid=uid, folder=folder)
+        return self._read_by_uid(email_id, folder, uid)
 
-    def _write_record(
+    def load_with_uid_fallback(
         self,
         email_id: str,
         message_id: str,
         folder: str,
-        uid: str | None,
-        payload: str | None,
-        checksum: str | None,
+        uid_hint: str | None,
+    ) -> EmailDetailsResponse | None:
+        """按 message_id 读取详情，未命中正文时再按 (folder, uid) 查找；在同一线程内完成两次读取"""
+        record = self._read_by_message_id(email_id, message_id)
+        if record and record.response:
+            return record.response
+        uid_candidate = uid_hint or (record.uid if record else None)
+        if uid_candidate and folder:
+            fallback = self._read_by_uid(email_id, folder, uid_candidate)
+            if fallback and fallback.response:
+                return fallback.response
+        return None
+
+    def _write_records(
+        self,
+        email_id: str,
+        records: list[tuple[str, str, str | None, bytes | None, int | None]],
     ) -> None:
+        """写入 (message_id, folder, uid, payload, checksum) 记录"""
         try:
             connection = self._connect()
         except Exception as exc:  # noqa: BLE001
@@ -265,10 +397,11 @@ class EmailDetailCacheRepository(_BaseCacheRepository):
         try:
             self._ensure_schema(connection)
             with connection.cursor() as cursor:
-                cursor.execute(
+                execute_values(
+                    cursor,
                     f"""
                     INSERT INTO "{self._table_name}" (email_id, message_id, folder, uid, payload, checksum, synced_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+                    VALUES %s
                     ON CONFLICT (email_id, message_id)
                     DO UPDATE SET
                         folder = EXCLUDED.folder,
@@ -276,24 +409,28 @@ class EmailDetailCacheRepository(_BaseCacheRepository):
                         payload = COALESCE(EXCLUDED.payload, "{self._table_name}"."payload"),
                         checksum = COALESCE(EXCLUDED.checksum, "{self._table_name}"."checksum"),
                         synced_at = CURRENT_TIMESTAMP
+                    WHERE "{self._table_name}"."checksum" IS DISTINCT FROM COALESCE(EXCLUDED.checksum, "{self._table_name}"."checksum")
+                        OR "{self._table_name}"."uid" IS DISTINCT FROM COALESCE(EXCLUDED.uid, "{self._table_name}"."uid")
+                        OR "{self._table_name}"."folder" IS DISTINCT FROM EXCLUDED.folder
                     """,
-                    (email_id, message_id, folder, uid, payload, checksum),
+                    [(email_id, *record) for record in records],
+                    template="(%s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)",
+                    page_size=500,
                 )
             connection.commit()
         except Exception as exc:  # noqa: BLE001
             connection.rollback()
-            logger.warning("Failed to persist detail cache for %s %s: %s", email_id, message_id, exc)
+            logger.warning("Failed to persist detail cache for %s (%s records): %s", email_id, len(records), exc)
         finally:
-            connection.close()
+            self._release(connection)
 
-    def _read_record(
-        self,
-        *,
-        email_id: str,
-        message_id: str | None,
-        uid: str | None,
-        folder: str | None,
-    ) -> CachedEmailDetail | None:
+    def _read_by_message_id(self, email_id: str, message_id: str) -> CachedEmailDetail | None:
+        return self._read_record(email_id, self._sql_by_message_id, (email_id, message_id))
+
+    def _read_by_uid(self, email_id: str, folder: str, uid: str) -> CachedEmailDetail | None:
+        return self._read_record(email_id, self._sql_by_uid, (email_id, folder, uid))
+
+    def _read_record(self, email_id: str, sql: str, params: tuple[str, ...]) -> CachedEmailDetail | None:
         try:
             connection = self._connect()
         except Exception as exc:  # noqa: BLE001
@@ -303,24 +440,7 @@ class EmailDetailCacheRepository(_BaseCacheRepository):
         try:
             self._ensure_schema(connection)
             with connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                if message_id is not None:
-                    cursor.execute(
-                        f"""
-                        SELECT folder, uid, payload
-                        FROM "{self._table_name}"
-                        WHERE email_id = %s AND message_id = %s
-                        """,
-                        (email_id, message_id),
-                    )
-                else:
-                    cursor.execute(
-                        f"""
-                        SELECT folder, uid, payload
-                        FROM "{self._table_name}"
-                        WHERE email_id = %s AND folder = %s AND uid = %s
-                        """,
-                        (email_id, folder, uid),
-                    )
+                cursor.execute(sql, params)
                 row = cursor.fetchone()
             connection.commit()
         except Exception as exc:  # noqa: BLE001
@@ -328,7 +448,7 @@ class EmailDetailCacheRepository(_BaseCacheRepository):
             logger.warning("Failed to read detail cache for %s: %s", email_id, exc)
             return None
         finally:
-            connection.close()
+            self._release(connection)
 
         if not row:
             return None
@@ -337,7 +457,7 @@ class EmailDetailCacheRepository(_BaseCacheRepository):
         payload = row.get("payload")
         if payload:
             try:
-                response = EmailDetailsResponse.model_validate_json(payload)
+                response = EmailDetailsResponse.model_validate_json(bytes(payload))
                 response.from_cache = True
             except Exception as exc:  # noqa: BLE001
                 logger.warning("Failed to parse detail cache payload for %s: %s", email_id, exc)
@@ -353,13 +473,14 @@ class EmailDetailCacheRepository(_BaseCacheRepository):
                 message_id VARCHAR(255) NOT NULL,
                 folder VARCHAR(64) NOT NULL,
                 uid VARCHAR(128),
-                payload TEXT,
-                checksum CHAR(64),
+                payload BYTEA,
+                checksum BIGINT,
                 synced_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
                 PRIMARY KEY (email_id, message_id)
             )
             """
         )
+        self._migrate_legacy_columns(cursor)
         cursor.execute(
             f"""
             CREATE UNIQUE INDEX IF NOT EXISTS "idx_{self._table_name}_uid"
@@ -1,15 +1,58 @@
 from __future__ import annotations
 
-import email
+import imaplib
+from email.parser import BytesParser
+from email.policy import compat32
+from typing import Callable, Dict, List
 
 from fastapi import HTTPException
 
 from app.config import logger
 from app.infrastructure.imap import imap_pool
 from app.models import AccountCredentials, EmailDetailsResponse
+from app.oauth import invalidate_access_token
 
+from .bodystructure import TextPart, decode_part, find_text_parts, parse_fetch_items
 from .utils import decode_header_value, extract_email_content, format_date
 
+_PARSER = BytesParser(policy=compat32)
+
+
+def _fetch_full_content(fetch: Callable[[str], tuple]) -> tuple[str, str]:
+    status, msg_data = fetch("(RFC822)")
+    raw_part = next(
+        (entry for entry in msg_data or [] if isinstance(entry, tuple) and isinstance(entry[1], (bytes, bytearray))),
+        None,
+    )
+    if status != "OK" or not raw_part:
+        raise HTTPException(status_code=404, detail="Email not found")
+    return extract_email_content(_PARSER.parsebytes(raw_part[1]))
+
+
+def _fetch_text_parts(fetch: Callable[[str], tuple], text_parts: List[TextPart]) -> tuple[str, str]:
+    if not text_parts:
+        return "", ""
+    status, msg_data = fetch("(" + " ".join(f"BODY[{part.section}]" for part in text_parts) + ")")
+    if status != "OK" or not msg_data:
+        raise HTTPException(status_code=404, detail="Email not found")
+    sections = parse_fetch_items(msg_data)
+
+    # 与 extract_email_content 一致：各取第一个非空的 text/plain 与 text/html
+    bodies: Dict[str, str] = {}
+    for part in text_parts:
+        if part.content_type in bodies:
+            continue
+        data = sections.get(f"BODY[{part.section}]")
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if not data:
+            continue
+        try:
+            bodies[part.content_type] = decode_part(data, part)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to decode email part (%s): %s", part.content_type, exc)
+    return bodies.get("text/plain", "").strip(), bodies.get("text/html", "").strip()
+
 
 def fetch_email_detail(
     credentials: AccountCredentials,
@@ -21,44 +64,43 @@ def fetch_email_detail(
 ) -> tuple[EmailDetailsResponse, str | None]:
     imap_client = None
     try:
-        imap_client = imap_pool.get_connection(credentials.email, access_token)
-        imap_client.select(folder_name)
-        if uid:
-            status, msg_data = imap_client.uid("FETCH", uid, "(RFC822)")
-        else:
-            status, msg_data = imap_client.fetch(msg_id, "(RFC822)")
+        try:
+            imap_client = imap_pool.get_connection(credentials.email, access_token)
+        except imaplib.IMAP4.error:
+            # XOAUTH2 认证被拒绝，缓存的访问令牌可能已失效
+            invalidate_access_token(credentials)
+            raise
+        imap_client.select_if_needed(folder_name, readonly=False)
+
+        def fetch(items: str):
+            return imap_client.uid("FETCH", uid, items) if uid else imap_client.fetch(msg_id, items)
+
+        # 先取结构与头部，正文只下载需要的文本部分，附件不经过网络
+        status, msg_data = fetch("(UID BODYSTRUCTURE BODY.PEEK[HEADER])")
         if status != "OK" or not msg_data:
             raise HTTPException(status_code=404, detail="Email not found")
-
-        raw_part = next((entry for entry in msg_data if isinstance(entry, tuple) and isinstance(entry[1], (bytes, bytearray))), None)
-        if not raw_part:
+        summary = parse_fetch_items(msg_data)
+        header_bytes = summary.get("BODY[HEADER]")
+        if isinstance(header_bytes, str):
+            header_bytes = header_bytes.encode("utf-8")
+        if not isinstance(header_bytes, bytes):
             raise HTTPException(status_code=404, detail="Email not found")
 
-        raw_email = raw_part[1]
-        msg = email.message_from_bytes(raw_email)
+        msg = _PARSER.parsebytes(header_bytes, headersonly=True)
         subject = decode_header_value(msg.get("Subject", "(No Subject)"))
         from_email = decode_header_value(msg.get("From", "(Unknown Sender)"))
         to_email = decode_header_value(msg.get("To", "(Unknown Recipient)"))
         date_str = msg.get("Date", "")
         formatted_date = format_date(date_str)
-        body_plain, body_html = extract_email_content(msg)
-
-        resolved_uid = uid
-
-        if not resolved_uid:
-            uid_status, uid_data = imap_client.fetch(msg_id, "(UID)")
-            if uid_status == "OK" and uid_data:
-                header = uid_data[0][0]
-                if isinstance(header, bytes):
-                    header = header.decode(errors="ignore")
-                if isinstance(header, str):
-                    parts = header.split()
-                    if "UID" in parts:
-                        try:
-                            uid_index = parts.index("UID")
-                            resolved_uid = parts[uid_index + 1].strip(")")
-                        except (ValueError, IndexError):  # noqa: PERF203
-                            resolved_uid = None
+
+        text_parts = find_text_parts(summary.get("BODYSTRUCTURE"))
+        if text_parts is None:
+            # 单部分邮件正文即全部内容，直接整封下载
+            body_plain, body_html = _fetch_full_content(fetch)
+        else:
+            body_plain, body_html = _fetch_text_parts(fetch, text_parts)
+
+        resolved_uid = uid or (summary.get("UID") if isinstance(summary.get("UID"), str) else None)
 
         response = EmailDetailsResponse(
             message_id=message_id,
@@ -1,15 +1,140 @@
 from __future__ import annotations
 
-import re
+import heapq
+import imaplib
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
 from typing import Dict, List
 
 from fastapi import HTTPException
 
 from app.config import logger
-from app.infrastructure.imap import imap_pool
+from app.infrastructure.imap import PooledIMAP4SSL, imap_pool
 from app.models import AccountCredentials, EmailItem, EmailListResponse
+from app.oauth import invalidate_access_token
 
 from .builders import build_email_items, parse_headers
+from .cache import folder_size_cache
+
+_BY_DATE = attrgetter("date")
+
+_folder_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="imap-folder")
+
+
+def _fetch_folder_items(imap_client: PooledIMAP4SSL, folder_name: str, sequence: bytes) -> List[EmailItem] | None:
+    try:
+        # 取文件夹大小时可能已选中该文件夹，此时不再重复 SELECT
+        if not imap_client.select_if_needed(folder_name, readonly=True):
+            return None
+        # UID 与头部在同一次 FETCH 中取回，省去一次往返
+        status, msg_data = imap_client.fetch(
+            sequence,
+            "(UID FLAGS BODY.PEEK[HEADER.FIELDS (SUBJECT DATE FROM MESSAGE-ID)])",
+        )
+        if status != "OK":
+            return None
+        uid_lookup: Dict[bytes, str] = {}
+        parsed_messages = parse_headers(msg_data, uid_lookup)
+        items = build_email_items(folder_name, parsed_messages, uid_lookup)
+        # FETCH 按序号升序返回，翻转后已基本按日期降序，排序只需线性扫描
+        items.reverse()
+        items.sort(key=_BY_DATE, reverse=True)
+        return items
+    except Exception as exc:  # noqa: BLE001
+        error_msg = f"Failed to fetch bulk emails from {folder_name}"
+        logger.warning("%s: %s", error_msg, exc)
+        return None
+
+
+def _fetch_folder_on_own_connection(
+    credentials: AccountCredentials,
+    access_token: str,
+    folder_name: str,
+    sequence: bytes,
+) -> List[EmailItem] | None:
+    imap_client = None
+    try:
+        # 不排队等待：请求线程已占用一个连接，再阻塞等待同一账户的连接会互相卡住
+        try:
+            imap_client = imap_pool.try_get_connection(credentials.email, access_token)
+        except imaplib.IMAP4.error:
+            # XOAUTH2 认证被拒绝，缓存的访问令牌可能已失效
+            invalidate_access_token(credentials)
+            raise
+        if imap_client is None:
+            return None
+        return _fetch_folder_items(imap_client, folder_name, sequence)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Failed to open extra connection for %s: %s", folder_name, exc)
+        return None
+    finally:
+        if imap_client:
+            try:
+                imap_pool.return_connection(credentials.email, imap_client)
+            except Exception:  # noqa: BLE001
+                pass
+
+
+def _load_page(
+    imap_client: PooledIMAP4SSL,
+    credentials: AccountCredentials,
+    access_token: str,
+    target_folders: List[str],
+    start: int,
+    end: int,
+    force_refresh: bool,
+) -> tuple[int, Dict[str, List[EmailItem] | None], List[str]]:
+    """按各文件夹大小换算并抓取当前页；返回总数、各文件夹条目以及抓取失败的文件夹"""
+    folder_totals: Dict[str, int] = {}
+
+    for folder_name in target_folders:
+        try:
+            size_key = (credentials.email, folder_name)
+            total = folder_size_cache.get(size_key, force_refresh)
+            if total is None:
+                # SELECT 的响应即为邮件数；序号 1..N 按到达顺序排列，无需 SEARCH ALL
+                status, data = imap_client.select(f'"{folder_name}"', readonly=True)
+                if status != "OK":
+                    continue
+                total = int(data[0]) if data and data[0] else 0
+                folder_size_cache.set(size_key, total)
+            folder_totals[folder_name] = total
+        except Exception as exc:  # noqa: BLE001
+            error_msg = f"Failed to access folder {folder_name}"
+            logger.warning("%s: %s", error_msg, exc)
+
+    total_emails = sum(folder_totals.values())
+
+    # 各文件夹按新到旧首尾相接构成全局列表，把当前页换算成每个文件夹的序号区间
+    grouped: Dict[str, bytes] = {}
+    offset = 0
+    for folder_name, count in folder_totals.items():
+        first = max(start - offset, 0)
+        last = min(end - offset, count)
+        if first < last:
+            grouped[folder_name] = f"{count - last + 1}:{count - first}".encode()
+        offset += count
+
+    # 第二个及之后的文件夹尽量在额外的池化连接上并行抓取，与当前连接上的第一个文件夹同时进行
+    folder_ranges = list(grouped.items())
+    extra_futures = [
+        (folder_name, _folder_executor.submit(
+            _fetch_folder_on_own_connection, credentials, access_token, folder_name, sequence
+        ))
+        for folder_name, sequence in folder_ranges[1:]
+    ]
+    per_folder_items: Dict[str, List[EmailItem] | None] = {}
+    if folder_ranges:
+        per_folder_items[folder_ranges[0][0]] = _fetch_folder_items(imap_client, *folder_ranges[0])
+    for (folder_name, future), (_, sequence) in zip(extra_futures, folder_ranges[1:]):
+        items = future.result()
+        if items is None:
+            # 没有可用的额外连接或抓取失败时，在当前连接上补抓，避免该文件夹从页面中缺失
+            items = _fetch_folder_items(imap_client, folder_name, sequence)
+        per_folder_items[folder_name] = items
+
+    failed = [folder_name for folder_name, items in per_folder_items.items() if items is None]
+    return total_emails, per_folder_items, failed
 
 
 def fetch_email_list(
@@ -18,80 +143,38 @@ def fetch_email_list(
     page: int,
     page_size: int,
     access_token: str,
+    force_refresh: bool = False,
 ) -> EmailListResponse:
     imap_client = None
     try:
-        imap_client = imap_pool.get_connection(credentials.email, access_token)
-        meta: List[Dict[str, bytes]] = []
-
+        try:
+            imap_client = imap_pool.get_connection(credentials.email, access_token)
+        except imaplib.IMAP4.error:
+            # XOAUTH2 认证被拒绝，缓存的访问令牌可能已失效
+            invalidate_access_token(credentials)
+            raise
         target_folders = ["INBOX"] if folder == "inbox" else ["Junk"] if folder == "junk" else ["INBOX", "Junk"]
-
-        for folder_name in target_folders:
-            try:
-                imap_client.select(f'"{folder_name}"', readonly=True)
-                status, messages = imap_client.search(None, "ALL")
-                if status != "OK" or not messages or not messages[0]:
-                    continue
-                message_ids = messages[0].split()
-                message_ids.reverse()
-                for msg_id in message_ids:
-                    meta.append({"folder": folder_name.encode(), "id": msg_id})
-            except Exception as exc:  # noqa: BLE001
-                error_msg = f"Failed to access folder {folder_name}"
-                logger.warning("%s: %s", error_msg, exc)
-
-        total_emails = len(meta)
         start = (page - 1) * page_size
         end = start + page_size
-        paginated = meta[start:end]
-
-        grouped: Dict[str, List[bytes]] = {}
-        for item in paginated:
-            folder_name = item["folder"].decode()
-            grouped.setdefault(folder_name, []).append(item["id"])
-
-        email_items: List[EmailItem] = []
 
-        uid_pattern = re.compile(r"(\d+)\s+\(UID\s+(\d+)")
-
-        for folder_name, ids in grouped.items():
-            try:
-                imap_client.select(f'"{folder_name}"', readonly=True)
-                if not ids:
-                    continue
-                sequence = b",".join(ids)
-                uid_lookup: Dict[bytes, str] = {}
-                status, uid_data = imap_client.fetch(sequence, "(UID)")
-                if status == "OK" and uid_data:
-                    for entry in uid_data:
-                        header_text = None
-                        if isinstance(entry, tuple):
-                            header_text = entry[0]
-                        elif isinstance(entry, (bytes, bytearray)):
-                            header_text = entry
-                        if not header_text:
-                            continue
-                        if isinstance(header_text, (bytes, bytearray)):
-                            header_text = header_text.decode(errors="ignore")
-                        match = uid_pattern.search(header_text or "")
-                        if match:
-                            seq_num = match.group(1).encode()
-                            uid_lookup[seq_num] = match.group(2)
-                status, msg_data = imap_client.fetch(
-                    sequence,
-                    "(FLAGS BODY.PEEK[HEADER.FIELDS (SUBJECT DATE FROM MESSAGE-ID)])",
+        total_emails, per_folder_items, failed = _load_page(
+            imap_client, credentials, access_token, target_folders, start, end, force_refresh
+        )
+        if failed:
+            # 文件夹大小可能来自缓存且已过期（如在其他客户端删除了邮件），序号区间越过 EXISTS 时 FETCH 会失败：
+            # 丢弃这些文件夹的大小缓存，若本次用的是缓存值则按最新大小重新换算并抓取
+            for folder_name in failed:
+                folder_size_cache.invalidate((credentials.email, folder_name))
+            if not force_refresh:
+                total_emails, per_folder_items, _ = _load_page(
+                    imap_client, credentials, access_token, target_folders, start, end, True
                 )
-                if status != "OK":
-                    continue
-                parsed_messages = parse_headers(msg_data)
-                email_items.extend(build_email_items(folder_name, parsed_messages, uid_lookup))
-            except Exception as exc:  # noqa: BLE001
-                error_msg = f"Failed to fetch bulk emails from {folder_name}"
-                logger.warning("%s: %s", error_msg, exc)
 
-        email_items.sort(key=lambda item: item.date, reverse=True)
+        # 各文件夹已各自有序，归并即可得到全局顺序
+        runs = [items for items in per_folder_items.values() if items]
+        email_items: List[EmailItem] = list(heapq.merge(*runs, key=_BY_DATE, reverse=True))
 
-        response = EmailListResponse(
+        response = EmailListResponse.model_construct(
             email_id=credentials.email,
             folder_view=folder,
             page=page,
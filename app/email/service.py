@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Coroutine, TypeVar
 
 from fastapi import HTTPException
 
 from app.accounts import account_service
-from app.config import logger
+from app.config import IMAP_WORKER_THREADS, logger
 from app.models import AccountCredentials, EmailDetailsResponse, EmailListResponse
 from app.oauth import fetch_access_token
 from app.email.cache_store import (
@@ -14,15 +16,28 @@ from app.email.cache_store import (
     email_list_cache_repository,
 )
 
-from .cache import email_cache
+from .cache import EMAIL_CACHE_STALE_SECONDS, email_cache, folder_size_cache
 from .details import fetch_email_detail
 from .listing import fetch_email_list
 
+_T = TypeVar("_T")
+
+# IMAP 往返可能持续数秒，放在专用线程池中执行，缓存读取等短任务仍走默认线程池
+_imap_executor = ThreadPoolExecutor(max_workers=IMAP_WORKER_THREADS, thread_name_prefix="imap-worker")
+
+
+async def _run_imap(func: Callable[[], _T]) -> _T:
+    return await asyncio.get_running_loop().run_in_executor(_imap_executor, func)
+
 
 class EmailService:
+    def __init__(self) -> None:
+        # 缓存键 -> 正在进行的加载任务，并发的相同请求共享同一次 IMAP 往返
+        self._inflight: dict[tuple, asyncio.Task] = {}
+
     @staticmethod
-    def cache_key(email_id: str, folder: str, page: int, page_size: int) -> str:
-        return f"{email_id}:{folder}:{page}:{page_size}"
+    def cache_key(email_id: str, folder: str, page: int, page_size: int) -> tuple[str, str, int, int]:
+        return email_id, folder, page, page_size
 
     async def list_emails(
         self,
@@ -33,10 +48,59 @@ class EmailService:
         force_refresh: bool = False,
     ) -> EmailListResponse:
         cache_key = self.cache_key(credentials.email, folder, page, page_size)
-        cached = email_cache.get(cache_key, force_refresh)
-        if cached:
-            return cached
+        if force_refresh:
+            email_cache.invalidate(cache_key)
+        else:
+            cached, is_stale = email_cache.get_allow_stale(cache_key, EMAIL_CACHE_STALE_SECONDS)
+            if cached:
+                if is_stale:
+                    self._schedule_list_refresh(credentials, folder, page, page_size, cache_key)
+                return cached
+
+        task = self._single_flight(
+            cache_key,
+            lambda: self._fetch_list(credentials, folder, page, page_size, cache_key, force_refresh),
+        )
+        return await asyncio.shield(task)
+
+    def _single_flight(self, key: tuple, factory: Callable[[], Coroutine[Any, Any, _T]]) -> asyncio.Task[_T]:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    def _schedule_list_refresh(
+        self,
+        credentials: AccountCredentials,
+        folder: str,
+        page: int,
+        page_size: int,
+        cache_key: tuple[str, str, int, int],
+    ) -> None:
+        if cache_key in self._inflight:
+            return
+        task = self._single_flight(
+            cache_key,
+            lambda: self._fetch_list(credentials, folder, page, page_size, cache_key, False),
+        )
+        task.add_done_callback(lambda done: self._on_list_refreshed(cache_key, done))
+
+    @staticmethod
+    def _on_list_refreshed(cache_key: tuple[str, str, int, int], task: asyncio.Task[EmailListResponse]) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background refresh failed for %s: %s", cache_key, task.exception())
 
+    async def _fetch_list(
+        self,
+        credentials: AccountCredentials,
+        folder: str,
+        page: int,
+        page_size: int,
+        cache_key: tuple[str, str, int, int],
+        force_refresh: bool,
+    ) -> EmailListResponse:
         try:
             access_token = await fetch_access_token(credentials)
         except HTTPException as exc:
@@ -58,6 +122,7 @@ class EmailService:
                 page=page,
                 page_size=page_size,
                 access_token=access_token,
+                force_refresh=force_refresh,
             )
             email_list_cache_repository.save(
                 credentials.email,
@@ -67,18 +132,14 @@ class EmailService:
                 result.emails,
                 result.total_emails,
             )
-            for item in result.emails:
-                if item.uid:
-                    email_detail_cache_repository.register_stub(
-                        credentials.email,
-                        item.message_id,
-                        item.folder,
-                        item.uid,
-                    )
+            email_detail_cache_repository.register_stubs(
+                credentials.email,
+                ((item.message_id, item.folder, item.uid) for item in result.emails),
+            )
             email_cache.set(cache_key, result)
             return result
         try:
-            return await asyncio.to_thread(_sync_list)
+            return await _run_imap(_sync_list)
         except HTTPException as exc:
             if exc.status_code >= 500:
                 cached_db = await self._load_cached_list(credentials.email, folder, page, page_size)
@@ -95,11 +156,23 @@ class EmailService:
             raise HTTPException(status_code=500, detail="Failed to retrieve emails") from exc
 
     async def get_email_details(self, credentials: AccountCredentials, message_id: str) -> EmailDetailsResponse:
-        try:
-            folder_name, msg_id = message_id.split("-", 1)
-        except ValueError as exc:  # noqa: B904
-            raise HTTPException(status_code=400, detail="Invalid message_id format") from exc
+        folder_name, separator, msg_id = message_id.partition("-")
+        if not separator:
+            raise HTTPException(status_code=400, detail="Invalid message_id format")
+
+        task = self._single_flight(
+            (credentials.email, "detail", message_id),
+            lambda: self._fetch_detail(credentials, message_id, folder_name, msg_id),
+        )
+        return await asyncio.shield(task)
 
+    async def _fetch_detail(
+        self,
+        credentials: AccountCredentials,
+        message_id: str,
+        folder_name: str,
+        msg_id: str,
+    ) -> EmailDetailsResponse:
         cached_detail = await asyncio.to_thread(
             email_detail_cache_repository.load,
             credentials.email,
@@ -138,7 +211,7 @@ class EmailService:
                 uid=uid_hint,
             )
         try:
-            detail_response, resolved_uid = await asyncio.to_thread(_sync_detail)
+            detail_response, resolved_uid = await _run_imap(_sync_detail)
             email_detail_cache_repository.save_detail(
                 credentials.email,
                 message_id,
@@ -187,29 +260,18 @@ class EmailService:
         if not email_detail_cache_repository.is_enabled:
             return None
 
-        detail_record = await asyncio.to_thread(
-            email_detail_cache_repository.load,
+        return await asyncio.to_thread(
+            email_detail_cache_repository.load_with_uid_fallback,
             email_id,
             message_id,
+            folder,
+            uid_hint,
         )
-        if detail_record and detail_record.response:
-            return detail_record.response
-
-        uid_candidate = uid_hint or (detail_record.uid if detail_record else None)
-        if uid_candidate and folder:
-            fallback = await asyncio.to_thread(
-                email_detail_cache_repository.load_by_uid,
-                email_id,
-                folder,
-                uid_candidate,
-            )
-            if fallback and fallback.response:
-                return fallback.response
-        return None
 
     def clear_cache(self, email_id: str | None = None) -> int:
-        prefix = f"{email_id}:" if email_id else None
-        return email_cache.clear(prefix)
+        account = email_id or None
+        folder_size_cache.clear(account)
+        return email_cache.clear(account)
 
 
 email_service = EmailService()
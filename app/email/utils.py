@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import email
-import re
 from datetime import datetime
 from email.header import decode_header
 from email.utils import parsedate_to_datetime
+from functools import lru_cache
 
 from app.config import logger
 
@@ -12,22 +12,27 @@ from app.config import logger
 def decode_header_value(header_value: str) -> str:
     if not header_value:
         return ""
+    return _decode_header_text(header_value if isinstance(header_value, str) else str(header_value))
+
+
+# 同一发件人/主题在邮箱中大量重复，缓存解码结果
+@lru_cache(maxsize=8192)
+def _decode_header_text(header_value: str) -> str:
     try:
-        decoded_parts = decode_header(str(header_value))
-        decoded_string = ""
-        for part, charset in decoded_parts:
+        parts: list[str] = []
+        for part, charset in decode_header(header_value):
             if isinstance(part, bytes):
                 try:
-                    encoding = charset if charset else "utf-8"
-                    decoded_string += part.decode(encoding, errors="replace")
-                except (LookupError, UnicodeDecodeError):
-                    decoded_string += part.decode("utf-8", errors="replace")
+                    parts.append(part.decode(charset or "utf-8", errors="replace"))
+                except LookupError:
+                    # 未知字符集按 UTF-8 兜底
+                    parts.append(part.decode("utf-8", errors="replace"))
             else:
-                decoded_string += str(part)
-        return decoded_string.strip()
+                parts.append(part)
+        return "".join(parts).strip()
     except Exception as exc:  # noqa: BLE001
         logger.warning("Failed to decode header value '%s': %s", header_value, exc)
-        return str(header_value) if header_value else ""
+        return header_value
 
 
 def extract_email_content(msg: email.message.EmailMessage) -> tuple[str, str]:
@@ -38,6 +43,8 @@ def extract_email_content(msg: email.message.EmailMessage) -> tuple[str, str]:
         if msg.is_multipart():
             for part in msg.walk():
                 content_type = part.get_content_type()
+                if content_type not in ("text/plain", "text/html"):
+                    continue
                 disposition = str(part.get("Content-Disposition", ""))
                 if "attachment" in disposition.lower():
                     continue
@@ -51,6 +58,9 @@ def extract_email_content(msg: email.message.EmailMessage) -> tuple[str, str]:
                         body_plain = decoded_content
                     elif content_type == "text/html" and not body_html:
                         body_html = decoded_content
+                    if body_plain and body_html:
+                        # 两种正文都已找到，剩余部分（通常是附件）无需再遍历
+                        break
                 except Exception as exc:  # noqa: BLE001
                     logger.warning("Failed to decode email part (%s): %s", content_type, exc)
         else:
@@ -71,18 +81,28 @@ def extract_email_content(msg: email.message.EmailMessage) -> tuple[str, str]:
     return body_plain.strip(), body_html.strip()
 
 
+# 同一发件人在列表中反复出现
+@lru_cache(maxsize=2048)
 def extract_sender_initial(from_email: str) -> str:
-    match = re.search(r"([a-zA-Z])", from_email)
-    return match.group(1).upper() if match else "?"
+    # 找第一个 ASCII 字母，直接逐字符判断比正则匹配轻量
+    for char in from_email:
+        if char.isascii() and char.isalpha():
+            return char.upper()
+    return "?"
 
 
 def format_date(date_str: str) -> str:
+    formatted = _format_date_header(str(date_str)) if date_str else None
+    # 解析失败时回退为当前时间，这部分不能缓存
+    return formatted if formatted is not None else datetime.now().isoformat()
+
+
+@lru_cache(maxsize=4096)
+def _format_date_header(date_str: str) -> str | None:
     try:
-        if date_str:
-            return parsedate_to_datetime(date_str).isoformat()
+        return parsedate_to_datetime(date_str).isoformat()
     except Exception:  # noqa: BLE001
-        pass
-    return datetime.now().isoformat()
+        return None
 
 
 __all__ = [
@@ -3,23 +3,75 @@ from __future__ import annotations
 import imaplib
 import socket
 import threading
-from queue import Empty, Queue
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from app.config import (
+    CONNECTION_IDLE_CHECK_SECONDS,
+    CONNECTION_TIMEOUT,
+    IMAP_PORT,
+    IMAP_SERVER,
+    MAX_CONNECTIONS,
+    SOCKET_TIMEOUT,
+    logger,
+)
+
+
+class PooledIMAP4SSL(imaplib.IMAP4_SSL):
+    """记录当前已选中文件夹的 IMAP 连接，连接复用时可跳过重复的 SELECT。"""
+
+    def __init__(self, *args, **kwargs) -> None:
+        self._selected_folder: tuple[str, bool] | None = None
+        # 最近一次命令成功完成的时间（time.monotonic()）；命令出错时归零，下次取用必定探测
+        self._last_used = 0.0
+        super().__init__(*args, **kwargs)
+
+    def _simple_command(self, name, *args):
+        try:
+            result = super()._simple_command(name, *args)
+        except Exception:
+            self._last_used = 0.0
+            raise
+        self._last_used = time.monotonic()
+        return result
+
+    def select(self, mailbox: str = "INBOX", readonly: bool = False):
+        self._selected_folder = None
+        status, data = super().select(mailbox, readonly)
+        if status == "OK":
+            self._selected_folder = (mailbox.strip('"'), readonly)
+        return status, data
+
+    def select_if_needed(self, folder: str, readonly: bool = True) -> bool:
+        """仅当目标文件夹（及只读模式）与当前选中状态不同时才发送 SELECT。"""
+        if self._selected_folder == (folder, readonly):
+            return True
+        status, _ = self.select(f'"{folder}"', readonly=readonly)
+        return status == "OK"
+
+
+@dataclass(slots=True)
+class _PoolEntry:
+    """单个账户的连接池：空闲连接、已建立的连接数，以及保护二者的条件变量。"""
 
-from app.config import CONNECTION_TIMEOUT, IMAP_PORT, IMAP_SERVER, MAX_CONNECTIONS, SOCKET_TIMEOUT, logger
+    idle: deque[PooledIMAP4SSL] = field(default_factory=deque)
+    count: int = 0
+    available: threading.Condition = field(default_factory=threading.Condition)
 
 
 class IMAPConnectionPool:
     def __init__(self, max_connections: int = MAX_CONNECTIONS) -> None:
         self.max_connections = max_connections
-        self.connections: dict[str, Queue[imaplib.IMAP4_SSL]] = {}
-        self.connection_count: dict[str, int] = {}
+        self.pools: dict[str, _PoolEntry] = {}
+        # 仅保护 pools 字典本身；各账户的取用与归还只锁各自的条目
         self.lock = threading.Lock()
         logger.info("Initialized IMAP connection pool with max_connections=%s", max_connections)
 
-    def _create_connection(self, email: str, access_token: str) -> imaplib.IMAP4_SSL:
+    def _create_connection(self, email: str, access_token: str) -> PooledIMAP4SSL:
         try:
             socket.setdefaulttimeout(SOCKET_TIMEOUT)
-            client = imaplib.IMAP4_SSL(IMAP_SERVER, IMAP_PORT)
+            client = PooledIMAP4SSL(IMAP_SERVER, IMAP_PORT)
             client.sock.settimeout(CONNECTION_TIMEOUT)
             auth_string = f"user={email}\x01auth=Bearer {access_token}\x01\x01".encode("utf-8")
             client.authenticate("XOAUTH2", lambda _: auth_string)
@@ -31,76 +83,131 @@ class IMAPConnectionPool:
             
             raise
 
-    def get_connection(self, email: str, access_token: str) -> imaplib.IMAP4_SSL:
-        with self.lock:
-            if email not in self.connections:
-                self.connections[email] = Queue(maxsize=self.max_connections)
-                self.connection_count[email] = 0
-
-            queue = self.connections[email]
-
-            try:
-                connection = queue.get_nowait()
+    def _entry(self, email: str) -> _PoolEntry:
+        entry = self.pools.get(email)
+        if entry is None:
+            with self.lock:
+                entry = self.pools.setdefault(email, _PoolEntry())
+        return entry
+
+    def _discard(self, entry: _PoolEntry) -> None:
+        with entry.available:
+            entry.count = max(0, entry.count - 1)
+            entry.available.notify()
+
+    def get_connection(self, email: str, access_token: str) -> PooledIMAP4SSL:
+        return self._acquire(email, access_token, wait=True)
+
+    def try_get_connection(self, email: str, access_token: str) -> PooledIMAP4SSL | None:
+        """不等待：有空闲连接或尚未达到上限时返回连接，否则返回 None"""
+        return self._acquire(email, access_token, wait=False)
+
+    def _acquire(self, email: str, access_token: str, wait: bool) -> PooledIMAP4SSL | None:
+        entry = self._entry(email)
+        deadline: float | None = None
+        while True:
+            # 条目锁只覆盖簿记；NOOP、建立连接都在锁外进行
+            with entry.available:
+                if entry.idle:
+                    connection: PooledIMAP4SSL | None = entry.idle.pop()
+                elif entry.count < self.max_connections:
+                    # 先占用名额，建立连接期间不持有锁
+                    entry.count += 1
+                    connection = None
+                elif not wait:
+                    return None
+                else:
+                    if deadline is None:
+                        logger.warning("Max connections (%s) reached for %s, waiting...", self.max_connections, email)
+                        deadline = time.monotonic() + 30
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        logger.error("Timeout waiting for connection for %s", email)
+                        raise TimeoutError(f"Timeout waiting for IMAP connection for {email}")
+                    entry.available.wait(remaining)
+                    continue
+
+            if connection is None:
                 try:
-                    connection.noop()
-                    logger.debug("Reused existing IMAP connection for %s", email)
-                    return connection
+                    return self._create_connection(email, access_token)
                 except Exception:  # noqa: BLE001
-                    self.connection_count[email] -= 1
-            except Empty:
-                pass
+                    self._discard(entry)
+                    raise
 
-            if self.connection_count[email] < self.max_connections:
-                connection = self._create_connection(email, access_token)
-                self.connection_count[email] += 1
+            try:
+                # 最近用过的连接直接复用，空闲较久才发 NOOP 探测
+                if time.monotonic() - connection._last_used >= CONNECTION_IDLE_CHECK_SECONDS:
+                    connection.noop()
+                logger.debug("Reused existing IMAP connection for %s", email)
                 return connection
-
-            logger.warning("Max connections (%s) reached for %s, waiting...", self.max_connections, email)
+            except Exception:  # noqa: BLE001
+                logger.debug("Existing connection invalid for %s, trying another one", email)
+                self._discard(entry)
+
+    def warmup(self, email: str, access_token: str, count: int) -> int:
+        """预先建立最多 count 个空闲连接（不超过上限），返回实际新建的数量"""
+        entry = self._entry(email)
+        target = min(count, self.max_connections)
+        created = 0
+        while True:
+            with entry.available:
+                if entry.count >= target:
+                    return created
+                entry.count += 1
             try:
-                return queue.get(timeout=30)
-            except Exception as exc:  # noqa: BLE001
-                logger.error("Timeout waiting for connection for %s: %s", email, exc)
-                raise
-
-    def return_connection(self, email: str, connection: imaplib.IMAP4_SSL) -> None:
-        if email not in self.connections:
+                connection = self._create_connection(email, access_token)
+            except Exception:  # noqa: BLE001
+                self._discard(entry)
+                return created
+            with entry.available:
+                entry.idle.append(connection)
+                entry.available.notify()
+            created += 1
+
+    def return_connection(self, email: str, connection: PooledIMAP4SSL) -> None:
+        entry = self.pools.get(email)
+        if entry is None:
             logger.warning("Attempting to return connection for unknown email: %s", email)
             return
-        try:
-            connection.noop()
-            self.connections[email].put_nowait(connection)
-            logger.debug("Successfully returned IMAP connection for %s", email)
-        except Exception as exc:  # noqa: BLE001
-            with self.lock:
-                if email in self.connection_count:
-                    self.connection_count[email] = max(0, self.connection_count[email] - 1)
-            logger.debug("Discarded invalid connection for %s: %s", email, exc)
+        # 不再发 NOOP，连接的可用性留到下次取用时按空闲时长判断
+        if connection.state == "LOGOUT":
+            self._discard(entry)
+            logger.debug("Discarded logged-out connection for %s", email)
+            return
+        with entry.available:
+            # 后进先出：最近归还的连接最可能免去空闲探测
+            entry.idle.append(connection)
+            entry.available.notify()
+        logger.debug("Successfully returned IMAP connection for %s", email)
 
     def close_all_connections(self, email: str | None = None) -> None:
         with self.lock:
-            if email:
-                if email in self.connections:
-                    closed = 0
-                    queue = self.connections[email]
-                    while not queue.empty():
-                        try:
-                            conn = queue.get_nowait()
-                            conn.logout()
-                            closed += 1
-                        except Exception as exc:  # noqa: BLE001
-                            logger.debug("Error closing connection: %s", exc)
-                    self.connection_count[email] = 0
-                    logger.info("Closed %s connections for %s", closed, email)
-                return
-
-            total_closed = 0
-            for email_key in list(self.connections.keys()):
-                count_before = self.connection_count.get(email_key, 0)
-                self.close_all_connections(email_key)
-                total_closed += count_before
+            targets = [email] if email else list(self.pools)
+
+        total_closed = 0
+        for email_key in targets:
+            entry = self.pools.get(email_key)
+            if entry is None:
+                continue
+            with entry.available:
+                idle = list(entry.idle)
+                entry.idle.clear()
+                # 仍被借出的连接保留名额，归还时再进入空闲队列
+                entry.count = max(0, entry.count - len(idle))
+            closed = 0
+            for conn in idle:
+                try:
+                    conn.logout()
+                    closed += 1
+                except Exception as exc:  # noqa: BLE001
+                    logger.debug("Error closing connection: %s", exc)
+            logger.info("Closed %s connections for %s", closed, email_key)
+            total_closed += closed
+
+        if email is None:
             logger.info("Closed total %s connections for all accounts", total_closed)
 
 
 imap_pool = IMAPConnectionPool()
 
-__all__ = ["IMAPConnectionPool", "imap_pool"]
+__all__ = ["IMAPConnectionPool", "PooledIMAP4SSL", "imap_pool"]
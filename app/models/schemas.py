@@ -1,16 +1,35 @@
 from __future__ import annotations
 
+import re
 from typing import List, Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.config import API_KEY_MAX_LENGTH
+
+# 代替 EmailStr：避免导入 email-validator，只做基本格式校验
+_EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# 仅后台管理接口使用的模型，延迟到首次使用时再构建校验器
+_ADMIN_MODEL_CONFIG = ConfigDict(defer_build=True)
 
 
 class AccountCredentials(BaseModel):
-    email: EmailStr
+    email: str
     refresh_token: str
     client_id: str
     tags: Optional[List[str]] = Field(default=[])
 
+    @field_validator("email")
+    @classmethod
+    def _validate_email(cls, value: str) -> str:
+        value = value.strip()
+        if not _EMAIL_PATTERN.match(value):
+            raise ValueError("邮箱格式不正确")
+        # 与 EmailStr 一致：域名部分转为小写
+        local, _, domain = value.rpartition("@")
+        return f"{local}@{domain.lower()}"
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -104,6 +123,8 @@ class UpdateTagsRequest(BaseModel):
 
 
 class UpdateNoteRequest(BaseModel):
+    model_config = _ADMIN_MODEL_CONFIG
+
     note: Optional[str] = None
 
 
@@ -117,14 +138,20 @@ class SyncResult(BaseModel):
 
 
 class LoginRequest(BaseModel):
+    model_config = _ADMIN_MODEL_CONFIG
+
     username: str
     password: str
 
 
 class ApiKeyRequest(BaseModel):
-    api_key: Optional[str] = None
+    model_config = _ADMIN_MODEL_CONFIG
+
+    api_key: Optional[str] = Field(default=None, max_length=API_KEY_MAX_LENGTH)
 
 
 class TokenHealthSettings(BaseModel):
+    model_config = _ADMIN_MODEL_CONFIG
+
     enabled: bool = True
     interval_minutes: int = Field(default=1440, ge=60, le=10080)
@@ -1,3 +1,3 @@
-from .client import fetch_access_token
+from .client import close_token_client, fetch_access_token, invalidate_access_token
 
-__all__ = ["fetch_access_token"]
+__all__ = ["close_token_client", "fetch_access_token", "invalidate_access_token"]
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+import time
+
 import httpx
 from fastapi import HTTPException
 
@@ -7,7 +10,86 @@ from app.config import OAUTH_SCOPE, TOKEN_URL, logger
 from app.models import AccountCredentials
 
 
-async def fetch_access_token(credentials: AccountCredentials) -> str:
+DEFAULT_TOKEN_TTL_SECONDS = 3600
+# 距过期不足该时长视为陈旧：先返回缓存令牌，同时在后台刷新
+TOKEN_REFRESH_AHEAD_SECONDS = 300
+# 距过期不足该时长视为已过期，必须等待新令牌
+TOKEN_EXPIRY_MARGIN_SECONDS = 60
+
+# (client_id, refresh_token) -> (access_token, expires_at)，expires_at 基于 time.monotonic()
+_TOKEN_CACHE: dict[tuple[str, str], tuple[str, float]] = {}
+
+# (client_id, refresh_token) -> 正在进行的令牌请求，调度器与界面刷新并发时共享同一个结果
+_INFLIGHT: dict[tuple[str, str], asyncio.Task[str]] = {}
+
+
+_CLIENT: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """令牌请求共用一个客户端，复用到令牌端点的 TLS 连接"""
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+        )
+    return _CLIENT
+
+
+async def close_token_client() -> None:
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+
+def _cache_key(credentials: AccountCredentials) -> tuple[str, str]:
+    return credentials.client_id, credentials.refresh_token
+
+
+async def fetch_access_token(credentials: AccountCredentials, force_refresh: bool = False) -> str:
+    """获取访问令牌；force_refresh 用于需要真正校验刷新令牌的场景（如令牌健康检查）"""
+    key = _cache_key(credentials)
+    cached = None if force_refresh else _TOKEN_CACHE.get(key)
+    if cached:
+        remaining = cached[1] - time.monotonic()
+        if remaining > TOKEN_REFRESH_AHEAD_SECONDS:
+            return cached[0]
+        if remaining > TOKEN_EXPIRY_MARGIN_SECONDS:
+            if key not in _INFLIGHT:
+                _start_request(key, credentials).add_done_callback(_log_background_failure)
+            return cached[0]
+
+    task = _INFLIGHT.get(key) or _start_request(key, credentials)
+    return await asyncio.shield(task)
+
+
+def invalidate_access_token(credentials: AccountCredentials) -> None:
+    """服务端拒绝缓存的令牌时丢弃缓存，下次调用重新刷新"""
+    _TOKEN_CACHE.pop(_cache_key(credentials), None)
+
+
+def _start_request(key: tuple[str, str], credentials: AccountCredentials) -> asyncio.Task[str]:
+    task = asyncio.create_task(_request_access_token(credentials))
+    _INFLIGHT[key] = task
+    task.add_done_callback(lambda _: _INFLIGHT.pop(key, None))
+    return task
+
+
+def _log_background_failure(task: asyncio.Task[str]) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background token refresh failed: %s", task.exception())
+
+
+def _parse_expires_in(token_data: dict[str, object]) -> int:
+    try:
+        return int(token_data.get("expires_in") or DEFAULT_TOKEN_TTL_SECONDS)
+    except (TypeError, ValueError):
+        return DEFAULT_TOKEN_TTL_SECONDS
+
+
+async def _request_access_token(credentials: AccountCredentials) -> str:
     payload = {
         "client_id": credentials.client_id,
         "grant_type": "refresh_token",
@@ -16,16 +98,16 @@ async def fetch_access_token(credentials: AccountCredentials) -> str:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(TOKEN_URL, data=payload)
-            response.raise_for_status()
-            token_data = response.json()
-            access_token = token_data.get("access_token")
-            if not access_token:
-                logger.error("No access token in response for %s", credentials.email)
-                raise HTTPException(status_code=401, detail="Failed to obtain access token from response")
-            logger.info("Successfully obtained access token for %s", credentials.email)
-            return access_token
+        response = await _get_client().post(TOKEN_URL, data=payload)
+        response.raise_for_status()
+        token_data = response.json()
+        access_token = token_data.get("access_token")
+        if not access_token:
+            logger.error("No access token in response for %s", credentials.email)
+            raise HTTPException(status_code=401, detail="Failed to obtain access token from response")
+        _TOKEN_CACHE[_cache_key(credentials)] = (access_token, time.monotonic() + _parse_expires_in(token_data))
+        logger.info("Successfully obtained access token for %s", credentials.email)
+        return access_token
     except httpx.HTTPStatusError as exc:
         error_msg = f"HTTP {exc.response.status_code} error getting access token"
         logger.error("%s for %s: %s", error_msg, credentials.email, exc)
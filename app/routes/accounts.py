@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Query, Response
 
-from app.accounts import account_service
+from app.accounts import SyncReport, account_service
 from app.models import (
     AccountCredentials,
     AccountListResponse,
@@ -11,26 +11,37 @@ from app.models import (
     UpdateNoteRequest,
     UpdateTagsRequest,
 )
-from app.security import require_api_key
+
+from .responses import json_response
 
 router = APIRouter(prefix="/accounts", tags=["accounts"])
 
 
+def _sync_result(report: SyncReport) -> SyncResult:
+    # SyncReport 字段类型已确定，直接构造，省去中间 dict 与一次校验
+    return SyncResult.model_construct(
+        message=report.message,
+        added=report.added,
+        updated=report.updated,
+        removed=report.removed,
+        skipped=report.skipped,
+        marked_deleted=report.marked_deleted,
+    )
+
+
 @router.get("", response_model=AccountListResponse)
 async def get_accounts(
     page: int = Query(1, ge=1, description="页码，从1开始"),
     page_size: int = Query(10, ge=1, le=100, description="每页数量，范围1-100"),
     email_search: str | None = Query(None, description="邮箱账号模糊搜索"),
     tag_search: str | None = Query(None, description="标签模糊搜索"),
-    _: None = Depends(require_api_key),
-) -> AccountListResponse:
-    return account_service.list_accounts(page, page_size, email_search, tag_search)
+) -> Response:
+    return json_response(account_service.list_accounts(page, page_size, email_search, tag_search))
 
 
 @router.post("", response_model=AccountResponse)
 async def register_account(
     credentials: AccountCredentials,
-    _: None = Depends(require_api_key),
 ) -> AccountResponse:
     return await account_service.register_account(credentials)
 
@@ -39,7 +50,6 @@ async def register_account(
 async def update_account_tags(
     email_id: str,
     request: UpdateTagsRequest,
-    _: None = Depends(require_api_key),
 ) -> AccountResponse:
     return account_service.update_tags(email_id, request)
 
@@ -48,7 +58,6 @@ async def update_account_tags(
 async def update_account_note(
     email_id: str,
     request: UpdateNoteRequest,
-    _: None = Depends(require_api_key),
 ) -> AccountResponse:
     return account_service.update_note(email_id, request)
 
@@ -56,22 +65,15 @@ async def update_account_note(
 @router.delete("/{email_id}", response_model=AccountResponse)
 async def delete_account(
     email_id: str,
-    _: None = Depends(require_api_key),
 ) -> AccountResponse:
     return account_service.delete_account(email_id)
 
 
 @router.post("/sync/push", response_model=SyncResult)
-async def sync_accounts_to_database(
-    _: None = Depends(require_api_key),
-) -> SyncResult:
-    report = account_service.sync_local_to_remote()
-    return SyncResult(**report.to_dict())
+async def sync_accounts_to_database() -> SyncResult:
+    return _sync_result(account_service.sync_local_to_remote())
 
 
 @router.post("/sync/pull", response_model=SyncResult)
-async def sync_accounts_from_database(
-    _: None = Depends(require_api_key),
-) -> SyncResult:
-    report = account_service.sync_remote_to_local()
-    return SyncResult(**report.to_dict())
+async def sync_accounts_from_database() -> SyncResult:
+    return _sync_result(account_service.sync_remote_to_local())
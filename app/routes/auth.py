@@ -57,13 +57,13 @@ async def set_api_key(
     payload: ApiKeyRequest,
     session: Dict[str, float] = Depends(require_session),
 ) -> Dict[str, str]:
-    new_key = security_service.set_api_key(payload.api_key, datetime.utcnow().isoformat())
+    new_key = await security_service.set_api_key(payload.api_key, datetime.utcnow().isoformat())
     return {"api_key": new_key}
 
 
 @router.delete("/api-key")
 async def delete_api_key(session: Dict[str, float] = Depends(require_session)) -> Dict[str, None]:
-    security_service.delete_api_key()
+    await security_service.delete_api_key()
     return {"api_key": None}
 
 
@@ -81,8 +81,7 @@ async def set_token_health_settings(
     payload: TokenHealthSettings,
     session: Dict[str, float] = Depends(require_session),
 ) -> TokenHealthSettings:
-    enabled = security_service.set_token_health_enabled(payload.enabled)
-    interval = security_service.set_token_health_interval(payload.interval_minutes)
+    enabled, interval = await security_service.set_token_health_settings(payload.enabled, payload.interval_minutes)
     scheduler = getattr(request.app.state, "token_health_scheduler", None)
     if scheduler:
         scheduler.trigger_immediate()
@@ -111,8 +110,17 @@ async def get_token_health_status(request: Request, session: Dict[str, float] =
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Scheduler not initialized")
     status_payload = scheduler.status()
     result = status_payload.last_result
+    progress = status_payload.progress
     return {
         "running": status_payload.running,
+        "progress": {
+            "total": progress.total,
+            "success": progress.success,
+            "failures": progress.failures,
+            "newly_expired": progress.newly_expired,
+        }
+        if progress
+        else None,
         "last_started_at": status_payload.last_started_at,
         "last_completed_at": status_payload.last_completed_at,
         "last_result": {
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from fastapi import Response
+from pydantic import BaseModel
+
+
+def json_response(model: BaseModel) -> Response:
+    """直接输出已构建好的模型；返回 Response 时 FastAPI 不再按 response_model 转 dict 再校验一遍"""
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+__all__ = ["json_response"]
@@ -1,20 +1,39 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Request, status
-from fastapi.responses import FileResponse, RedirectResponse
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+from fastapi import APIRouter, Request, Response, status
+from fastapi.responses import RedirectResponse
 
 from app.config import SESSION_COOKIE_NAME
-from app.security import require_api_key, security_service
+from app.security import security_service
 
 router = APIRouter(tags=["web"])
 
 
+@lru_cache(maxsize=None)
+def _load_page(path: str) -> tuple[bytes, str]:
+    # 页面文件随镜像发布、运行期不变：首次访问时读入内存并计算 ETag
+    content = Path(path).read_bytes()
+    return content, f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+def _html_page(request: Request, path: str) -> Response:
+    content, etag = _load_page(path)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=content, media_type="text/html", headers=headers)
+
+
 @router.get("/")
 async def root(request: Request):
     session_id = request.cookies.get(SESSION_COOKIE_NAME)
     if not session_id or not security_service.get_session(session_id):
         return RedirectResponse(url="/login", status_code=status.HTTP_303_SEE_OTHER)
-    return FileResponse("static/index.html")
+    return _html_page(request, "static/index.html")
 
 
 @router.get("/login")
@@ -22,13 +41,11 @@ async def login_page(request: Request):
     session_id = request.cookies.get(SESSION_COOKIE_NAME)
     if session_id and security_service.get_session(session_id):
         return RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
-    return FileResponse("static/login.html")
+    return _html_page(request, "static/login.html")
 
 
 @router.get("/api")
-async def api_status(
-    _: None = Depends(require_api_key),
-) -> dict[str, object]:
+async def api_status() -> dict[str, object]:
     return {
         "message": "Outlook邮件API服务正在运行",
         "version": "1.0.0",
@@ -1,10 +1,12 @@
 from .api_keys import ApiKeyStore, SecurityState
 from .dependencies import require_api_key, require_authenticated_request, require_session
 from .failures import FailureEntry, FailureRegistry
+from .middleware import ApiKeyMiddleware
 from .service import SecurityService, security_service
 from .sessions import SessionStore
 
 __all__ = [
+    "ApiKeyMiddleware",
     "ApiKeyStore",
     "FailureEntry",
     "FailureRegistry",
@@ -3,10 +3,13 @@ from __future__ import annotations
 import hashlib
 import hmac
 import secrets
+from functools import lru_cache
 from typing import Optional
 
 from fastapi import HTTPException, Request, status
 
+from app.config import API_KEY_MAX_LENGTH
+
 from .api_keys import ApiKeyStore
 from .failures import FailureRegistry
 from .auth import client_ip
@@ -36,6 +39,11 @@ def require_api_key(
         failures.register_failure(ip)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="无效的 API Key")
 
+    # 只按公开的长度上限提前拒绝，不与已保存的 Key 比较，避免泄露其长度
+    if len(provided_key) > API_KEY_MAX_LENGTH:
+        failures.register_failure(ip)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="API Key 不正确")
+
     provided_hash = hash_api_key(provided_key)
     if not hmac.compare_digest(provided_hash, stored_hash):
         failures.register_failure(ip)
@@ -52,14 +60,19 @@ def set_api_key(store: ApiKeyStore, api_key: Optional[str], timestamp: str) -> s
     new_key = api_key or secrets.token_urlsafe(32)
     hashed = hash_api_key(new_key)
     store.update(new_key, hashed, timestamp)
+    # 旧 Key 的明文不再需要留在缓存里
+    hash_api_key.cache_clear()
     return new_key
 
 
 def delete_api_key(store: ApiKeyStore) -> None:
     store.clear()
+    hash_api_key.cache_clear()
 
 
+@lru_cache(maxsize=1024)
 def hash_api_key(api_key: str) -> str:
+    # 每个带 Key 的请求都会调用，缓存后重复请求无需再算 SHA-256
     return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
 
 
@@ -22,6 +22,10 @@ class ApiKeyStore:
     def __init__(self, file_path: str = SECURITY_FILE) -> None:
         self._path = Path(file_path)
         self._lock = threading.Lock()
+        # 磁盘写入单独加锁，序列化与写文件期间不阻塞读取
+        self._write_lock = threading.Lock()
+        self._version = 0
+        self._written_version = 0
         self._state = SecurityState()
         self._load()
 
@@ -29,8 +33,7 @@ class ApiKeyStore:
         if not self._path.exists():
             return
         try:
-            with self._path.open("r", encoding="utf-8") as fh:
-                data = json.load(fh)
+            data = json.loads(self._path.read_bytes())
             self._state = SecurityState(
                 api_key_plain=data.get("api_key_plain"),
                 api_key_hash=data.get("api_key_hash"),
@@ -41,12 +44,22 @@ class ApiKeyStore:
         except Exception as exc:  # noqa: BLE001
             logger.error("Failed to load security configuration: %s", exc)
 
-    def _persist(self) -> None:
-        try:
-            with self._path.open("w", encoding="utf-8") as fh:
-                json.dump(self._state.__dict__, fh, indent=2, ensure_ascii=False)
-        except Exception as exc:  # noqa: BLE001
-            logger.error("Failed to persist security configuration: %s", exc)
+    def _snapshot_locked(self) -> tuple[int, dict[str, object]]:
+        """在持有 _lock 时调用：为当前状态编号并复制一份用于写盘"""
+        self._version += 1
+        return self._version, dict(self._state.__dict__)
+
+    def _persist(self, snapshot: tuple[int, dict[str, object]]) -> None:
+        version, data = snapshot
+        with self._write_lock:
+            # 并发修改时可能后拿到写锁的是旧快照，已写入更新版本则跳过
+            if version <= self._written_version:
+                return
+            try:
+                self._path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+                self._written_version = version
+            except Exception as exc:  # noqa: BLE001
+                logger.error("Failed to persist security configuration: %s", exc)
 
     def get_plain(self) -> Optional[str]:
         with self._lock:
@@ -61,7 +74,8 @@ class ApiKeyStore:
             self._state.api_key_plain = plain_key
             self._state.api_key_hash = hashed_key
             self._state.updated_at = updated_at
-            self._persist()
+            snapshot = self._snapshot_locked()
+        self._persist(snapshot)
 
     def clear(self) -> None:
         self.update(None, None, None)
@@ -73,7 +87,8 @@ class ApiKeyStore:
     def set_token_health_enabled(self, enabled: bool) -> None:
         with self._lock:
             self._state.token_health_enabled = bool(enabled)
-            self._persist()
+            snapshot = self._snapshot_locked()
+        self._persist(snapshot)
 
     def get_token_health_interval(self) -> int:
         with self._lock:
@@ -83,8 +98,19 @@ class ApiKeyStore:
         minutes = max(60, int(minutes or 1440))
         with self._lock:
             self._state.token_health_interval_minutes = minutes
-            self._persist()
-            return minutes
+            snapshot = self._snapshot_locked()
+        self._persist(snapshot)
+        return minutes
+
+    def set_token_health_settings(self, enabled: bool, minutes: int) -> int:
+        """同时更新开关与间隔，只写一次磁盘"""
+        minutes = max(60, int(minutes or 1440))
+        with self._lock:
+            self._state.token_health_enabled = bool(enabled)
+            self._state.token_health_interval_minutes = minutes
+            snapshot = self._snapshot_locked()
+        self._persist(snapshot)
+        return minutes
 
 
 __all__ = ["ApiKeyStore", "SecurityState"]
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .service import SecurityService
+
+# 需要 API Key 的路径；登录页、/auth/*、静态资源与文档不受影响
+API_KEY_PROTECTED_PREFIXES = ("/accounts", "/emails", "/cache", "/api")
+
+
+def _is_protected(path: str) -> bool:
+    for prefix in API_KEY_PROTECTED_PREFIXES:
+        if path == prefix or path.startswith(prefix + "/"):
+            return True
+    return False
+
+
+class ApiKeyMiddleware:
+    """在路由前统一校验 API Key，替代每个路由上的 Depends(require_api_key)"""
+
+    def __init__(self, app: ASGIApp, service: SecurityService) -> None:
+        self.app = app
+        self.service = service
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _is_protected(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.service.require_api_key(Request(scope))
+        except HTTPException as exc:
+            # 中间件位于 FastAPI 异常处理之外，按默认格式直接返回
+            response = JSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=exc.headers)
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+__all__ = ["API_KEY_PROTECTED_PREFIXES", "ApiKeyMiddleware"]
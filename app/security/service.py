@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import asyncio
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi import Request
 
@@ -45,24 +46,29 @@ class SecurityService:
     def get_api_key(self) -> Optional[str]:
         return get_api_key(self.api_key_store)
 
-    def set_api_key(self, api_key: Optional[str], timestamp: str) -> str:
-        return set_api_key(self.api_key_store, api_key, timestamp)
+    # 以下写操作会落盘，放到线程中执行，避免阻塞事件循环
+    async def set_api_key(self, api_key: Optional[str], timestamp: str) -> str:
+        return await asyncio.to_thread(set_api_key, self.api_key_store, api_key, timestamp)
 
-    def delete_api_key(self) -> None:
-        delete_api_key(self.api_key_store)
+    async def delete_api_key(self) -> None:
+        await asyncio.to_thread(delete_api_key, self.api_key_store)
 
     def is_token_health_enabled(self) -> bool:
         return self.api_key_store.token_health_enabled()
 
-    def set_token_health_enabled(self, enabled: bool) -> bool:
-        self.api_key_store.set_token_health_enabled(enabled)
+    async def set_token_health_enabled(self, enabled: bool) -> bool:
+        await asyncio.to_thread(self.api_key_store.set_token_health_enabled, enabled)
         return enabled
 
     def get_token_health_interval(self) -> int:
         return self.api_key_store.get_token_health_interval()
 
-    def set_token_health_interval(self, minutes: int) -> int:
-        return self.api_key_store.set_token_health_interval(minutes)
+    async def set_token_health_interval(self, minutes: int) -> int:
+        return await asyncio.to_thread(self.api_key_store.set_token_health_interval, minutes)
+
+    async def set_token_health_settings(self, enabled: bool, minutes: int) -> Tuple[bool, int]:
+        interval = await asyncio.to_thread(self.api_key_store.set_token_health_settings, enabled, minutes)
+        return enabled, interval
 
 
 security_service = SecurityService()
@@ -3,19 +3,27 @@ from __future__ import annotations
 import secrets
 import threading
 import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+SESSION_SHARDS = 16
 
 
 class SessionStore:
-    def __init__(self) -> None:
-        self._sessions: Dict[str, Dict[str, float]] = {}
-        self._lock = threading.Lock()
+    def __init__(self, shards: int = SESSION_SHARDS) -> None:
+        # 按会话 ID 分片加锁，并发请求不必争用同一把锁
+        self._shards: List[Tuple[threading.Lock, Dict[str, Dict[str, float]]]] = [
+            (threading.Lock(), {}) for _ in range(max(1, shards))
+        ]
+
+    def _shard(self, session_id: str) -> Tuple[threading.Lock, Dict[str, Dict[str, float]]]:
+        return self._shards[hash(session_id) % len(self._shards)]
 
     def create(self, username: str) -> str:
         session_id = secrets.token_urlsafe(32)
         now = time.time()
-        with self._lock:
-            self._sessions[session_id] = {
+        lock, sessions = self._shard(session_id)
+        with lock:
+            sessions[session_id] = {
                 "username": username,
                 "created_at": now,
                 "last_active": now,
@@ -23,15 +31,17 @@ class SessionStore:
         return session_id
 
     def get(self, session_id: str) -> Optional[Dict[str, float]]:
-        with self._lock:
-            session = self._sessions.get(session_id)
+        lock, sessions = self._shard(session_id)
+        with lock:
+            session = sessions.get(session_id)
             if session:
                 session["last_active"] = time.time()
             return session
 
     def remove(self, session_id: str) -> None:
-        with self._lock:
-            self._sessions.pop(session_id, None)
+        lock, sessions = self._shard(session_id)
+        with lock:
+            sessions.pop(session_id, None)
 
 
 __all__ = ["SessionStore"]
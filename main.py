@@ -5,25 +5,41 @@ FastAPI 应用初始化、生命周期管理及路由装载。
 
 from __future__ import annotations
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from app.accounts.service import account_repository
-from app.config import MAX_CONNECTIONS, logger
+from app.config import (
+    DEFAULT_THREAD_LIMIT,
+    IMAP_WARMUP_ACCOUNTS,
+    IMAP_WARMUP_CONNECTIONS,
+    MAX_CONNECTIONS,
+    logger,
+)
+from app.core.pool_warmup import warm_imap_pool
 from app.core.token_health import TokenHealthScheduler, TokenHealthService
 from app.infrastructure.imap import imap_pool
+from app.oauth import close_token_client
 from app.routes import routers
-from app.security import security_service
+from app.security import ApiKeyMiddleware, security_service
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Starting Outlook Email Management System...")
     logger.info("IMAP connection pool initialized with max_connections=%s", MAX_CONNECTIONS)
+    # AnyIO 默认仅 40 个线程令牌，asyncio 默认线程池也偏小，并发阻塞调用多时会排队
+    anyio.to_thread.current_default_thread_limiter().total_tokens = DEFAULT_THREAD_LIMIT
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=DEFAULT_THREAD_LIMIT, thread_name_prefix="default-worker")
+    )
     token_health_service = TokenHealthService(account_repository)
     token_health_scheduler = TokenHealthScheduler(
         token_health_service,
@@ -32,6 +48,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     )
     app.state.token_health_scheduler = token_health_scheduler
     token_health_scheduler.start()
+    warmup_task = None
+    if IMAP_WARMUP_ACCOUNTS > 0:
+        # 后台预热，不阻塞启动
+        warmup_task = asyncio.create_task(
+            warm_imap_pool(account_repository, IMAP_WARMUP_ACCOUNTS, IMAP_WARMUP_CONNECTIONS)
+        )
     try:
         yield
     finally:
@@ -40,8 +62,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         scheduler = getattr(app.state, "token_health_scheduler", None)
         if scheduler:
             await scheduler.stop()
+        if warmup_task and not warmup_task.done():
+            warmup_task.cancel()
         logger.info("Closing IMAP connection pool...")
         imap_pool.close_all_connections()
+        await close_token_client()
         logger.info("Application shutdown complete.")
 
 
@@ -52,6 +77,8 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# 先添加的位于内层：CORS 预检请求在 API Key 校验之前由 CORSMiddleware 处理
+app.add_middleware(ApiKeyMiddleware, service=security_service)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
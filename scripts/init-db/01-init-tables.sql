@@ -6,8 +6,8 @@
 CREATE TABLE IF NOT EXISTS account_backups (
     "email" VARCHAR(255) NOT NULL PRIMARY KEY,
     "data" TEXT NOT NULL,
-    "checksum" CHAR(64) NOT NULL,
-    "tags" TEXT,
+    "checksum" BIGINT NOT NULL,
+    "tags" TEXT GENERATED ALWAYS AS (CASE WHEN "is_deleted" THEN '[]' ELSE (("data"::jsonb -> 'tags')::text) END) STORED,
     "note" TEXT,
     "is_deleted" BOOLEAN NOT NULL DEFAULT FALSE,
     "source" VARCHAR(32) NOT NULL DEFAULT 'unknown',
@@ -23,6 +23,7 @@ CREATE TABLE IF NOT EXISTS account_backups_tags (
 
 -- 创建索引以提高查询性能
 CREATE INDEX IF NOT EXISTS "idx_account_backups_tags_email" ON "account_backups_tags" ("email");
+CREATE INDEX IF NOT EXISTS "idx_account_backups_is_deleted_email" ON "account_backups" ("is_deleted", "email");
 
 -- 创建触发器函数，自动更新updated_at字段
 CREATE OR REPLACE FUNCTION update_updated_at_column()